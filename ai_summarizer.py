@@ -5,7 +5,189 @@ import os
 import json
 import time
 import logging
+import tempfile
+from functools import lru_cache
 from openai import OpenAI
+from json_utils import dump_json
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# 要約に使用するモデル
+MODEL_NAME = "gpt-4o-mini"
+
+# プロンプトテンプレート中の論文テキストの差し込み位置
+PAPER_TEXT_PLACEHOLDER = "{論文テキスト}"
+
+# OpenAIに送る論文テキストの最大トークン数（要約には論文の前半で十分なため、超過分は切り捨てる）
+MAX_INPUT_TOKENS = 12000
+
+# tiktokenが使えない場合に使う、1トークンあたりの文字数の目安
+CHARS_PER_TOKEN = 4
+
+# Batch APIのポーリング間隔（秒）。指数バックオフで最大間隔まで延ばす
+BATCH_POLL_INTERVAL = 10
+BATCH_MAX_POLL_INTERVAL = 600
+
+# Batch APIの完了を待つ最大時間（秒）。completion_window（24時間）に合わせる
+BATCH_MAX_WAIT = 24 * 60 * 60
+
+@lru_cache(maxsize=1)
+def get_encoding(model=MODEL_NAME):
+    """
+    モデルに対応するtiktokenのエンコーディングを取得する
+    
+    Args:
+        model (str): モデル名
+    
+    Returns:
+        tiktoken.Encoding: エンコーディング（tiktokenが使えない場合はNone）
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception as e:
+        logging.warning("tiktokenのエンコーディングを取得できませんでした。文字数で切り詰めます: %s", e)
+        return None
+
+def truncate_text(text, max_tokens=MAX_INPUT_TOKENS):
+    """
+    論文テキストを最大トークン数までに切り詰める
+    
+    Args:
+        text (str): 論文テキスト
+        max_tokens (int): 最大トークン数
+    
+    Returns:
+        str: 切り詰めたテキスト
+    """
+    encoding = get_encoding()
+    if encoding is None:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        if len(text) > max_chars:
+            logging.info("論文テキストを切り詰めました（%s文字 → %s文字）", len(text), max_chars)
+            return text[:max_chars]
+        return text
+    
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) > max_tokens:
+        logging.info("論文テキストを切り詰めました（%sトークン → %sトークン）", len(tokens), max_tokens)
+        return encoding.decode(tokens[:max_tokens])
+    return text
+
+@lru_cache(maxsize=4)
+def split_prompt_template(prompt_template):
+    """
+    プロンプトテンプレートを論文テキストの差し込み位置で分割する（テンプレートごとに一度だけ）
+    
+    Args:
+        prompt_template (str): プロンプトテンプレート
+    
+    Returns:
+        tuple: 差し込み位置で分割したテンプレートの断片
+    """
+    return tuple(prompt_template.split(PAPER_TEXT_PLACEHOLDER))
+
+def get_summary_output_path(output_dir, paper_title, arxiv_id=None):
+    """
+    要約結果を保存するJSONファイルのパスを取得する
+    
+    Args:
+        output_dir (str): 出力先ディレクトリ
+        paper_title (str): 論文タイトル
+        arxiv_id (str, optional): arXiv ID
+    
+    Returns:
+        str: 要約結果ファイルのパス
+    """
+    # ファイル名を作成（arXiv IDがある場合はそれを使用）
+    if arxiv_id:
+        return os.path.join(output_dir, f"{arxiv_id}_summary.json")
+    filename = paper_title.replace(" ", "_").replace("/", "_")[:50]
+    return os.path.join(output_dir, f"{filename}.json")
+
+def build_prompt(text, prompt_template):
+    """
+    論文テキストをプロンプトテンプレートに差し込む（最大トークン数を超える分は切り捨てる）
+    
+    Args:
+        text (str): 論文テキスト
+        prompt_template (str): プロンプトテンプレート
+    
+    Returns:
+        str: プロンプト
+    """
+    text = truncate_text(text)
+    return text.join(split_prompt_template(prompt_template))
+
+def build_request_body(prompt):
+    """
+    Chat Completions APIのリクエストボディを作成する（通常の呼び出しとBatch APIで共通）
+    
+    Args:
+        prompt (str): プロンプト
+    
+    Returns:
+        dict: リクエストボディ
+    """
+    return {
+        "model": MODEL_NAME,
+        "messages": [
+            {"role": "system", "content": "あなたは研究論文を中学生向けにわかりやすく紹介するゆるキャラです。"},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": 300
+    }
+
+def save_summary_result(summary_text, output_path, paper_title, arxiv_id=None):
+    """
+    要約から投稿文を作成し、結果をJSONファイルに保存する
+    
+    Args:
+        summary_text (str): 生成された要約
+        output_path (str): 要約結果ファイルのパス
+        paper_title (str): 論文タイトル
+        arxiv_id (str, optional): arXiv ID
+    
+    Returns:
+        dict: 生成された要約と挨拶文
+    """
+    # 要約の文字数制限を削除
+    # 元々は120文字に制限していたが、全文を保持するように変更
+    
+    # 投稿文を作成
+    logging.info("Twitter投稿用テキストを作成中...")
+    post_text = f"C(・ω・ )つ みんなー！{summary_text}"
+    
+    # 文字数制限（280文字）
+    original_length = len(post_text)
+    if original_length > 130:
+        post_text = post_text[:277] + "..."
+        logging.info("投稿テキストを短縮しました（%s文字 → %s文字）", original_length, len(post_text))
+    else:
+        logging.info("投稿テキスト作成完了（文字数: %s文字）", len(post_text))
+    
+    # 結果を辞書にまとめる
+    result = {
+        "title": paper_title,
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "summary": summary_text,
+        "post_text": post_text
+    }
+    
+    # arXiv IDがある場合は追加
+    if 'arxiv_id' in locals() or 'arxiv_id' in globals():
+        result["arxiv_id"] = arxiv_id
+    
+    # 結果をJSONファイルに保存
+    logging.info("要約結果をファイルに保存中: %s", output_path)
+    dump_json(result, output_path)
+    
+    logging.info("要約生成・保存完了: %s", output_path)
+    return result
 
 def generate_summary(client, text, prompt_template, output_dir, paper_title, arxiv_id=None):
     """
@@ -22,18 +204,13 @@ def generate_summary(client, text, prompt_template, output_dir, paper_title, arx
     Returns:
         dict: 生成された要約と挨拶文
     """
-    # ファイル名を作成（arXiv IDがある場合はそれを使用）
-    if arxiv_id:
-        output_path = os.path.join(output_dir, f"{arxiv_id}_summary.json")
-    else:
-        filename = paper_title.replace(" ", "_").replace("/", "_")[:50]
-        output_path = os.path.join(output_dir, f"{filename}.json")
+    output_path = get_summary_output_path(output_dir, paper_title, arxiv_id)
     
     try:
         # プロンプトを作成
-        logging.info(f"論文 '{paper_title}' のプロンプトを作成中...")
-        prompt = prompt_template.replace("{論文テキスト}", text)
-        logging.info(f"プロンプト作成完了（文字数: {len(prompt)}文字）")
+        logging.info("論文 '%s' のプロンプトを作成中...", paper_title)
+        prompt = build_prompt(text, prompt_template)
+        logging.info("プロンプト作成完了（文字数: %s文字）", len(prompt))
         
         # OpenAI APIを呼び出し - リトライロジックを追加
         max_retries = 3
@@ -41,22 +218,14 @@ def generate_summary(client, text, prompt_template, output_dir, paper_title, arx
         backoff_time = 2  # 初期バックオフ時間（秒）
         while retry_count < max_retries:
             try:
-                logging.info(f"OpenAI APIを呼び出し中... (試行: {retry_count + 1}/{max_retries})")
+                logging.info("OpenAI APIを呼び出し中... (試行: %s/%s)", retry_count + 1, max_retries)
                 api_start_time = time.time()
                 
-                response = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": "あなたは研究論文を中学生向けにわかりやすく紹介するゆるキャラです。"},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=300
-                )
+                response = client.chat.completions.create(**build_request_body(prompt))
                 
                 api_end_time = time.time()
                 api_duration = api_end_time - api_start_time
-                logging.info(f"OpenAI API呼び出し完了（所要時間: {api_duration:.2f}秒）")
-                break  # 成功したらループを抜ける
+                logging.info("OpenAI API呼び出し完了（所要時間: %.2f秒）", api_duration)
                 break  # 成功したらループを抜ける
             except Exception as api_error:
                 retry_count += 1
@@ -65,53 +234,127 @@ def generate_summary(client, text, prompt_template, output_dir, paper_title, arx
                 
                 # エラーの種類に応じてバックオフ時間を調整
                 if hasattr(api_error, 'status_code') and api_error.status_code == 429:
-                    logging.warning(f"API制限エラー（429）が発生しました。{backoff_time}秒後にリトライします。({retry_count}/{max_retries})")
+                    logging.warning("API制限エラー（429）が発生しました。%s秒後にリトライします。(%s/%s)", backoff_time, retry_count, max_retries)
                 else:
-                    logging.warning(f"APIエラーが発生しました: {str(api_error)}。{backoff_time}秒後にリトライします。({retry_count}/{max_retries})")
+                    logging.warning("APIエラーが発生しました: %s。%s秒後にリトライします。(%s/%s)", api_error, backoff_time, retry_count, max_retries)
                 
                 time.sleep(backoff_time)
                 backoff_time *= 2  # 指数バックオフ
         # 応答から要約を取得
         logging.info("APIレスポンスから要約を抽出中...")
         summary_text = response.choices[0].message.content.strip()
-        logging.info(f"要約抽出完了（文字数: {len(summary_text)}文字）")
-        summary_text = response.choices[0].message.content.strip()
-        
-        # 要約の文字数制限を削除
-        # 元々は120文字に制限していたが、全文を保持するように変更
+        logging.info("要約抽出完了（文字数: %s文字）", len(summary_text))
         
-        # 投稿文を作成
-        logging.info("Twitter投稿用テキストを作成中...")
-        post_text = f"C(・ω・ )つ みんなー！{summary_text}"
+        return save_summary_result(summary_text, output_path, paper_title, arxiv_id)
+    
+    except Exception as e:
+        logging.error("要約生成エラー: %s", e)
+        return None
+
+def generate_summaries_batch(client, papers, prompt_template, output_dir, work_dir):
+    """
+    OpenAIのBatch APIで複数の論文の要約をまとめて生成する
+    
+    リクエストをJSONLファイルにまとめてアップロードし、バッチの完了をポーリングで待つ。
+    結果が返るまで時間がかかる（最大24時間）代わりに、料金は通常の呼び出しの半額になる。
+    入力ファイルは一時ファイルとして作成し、アップロードしたファイルとともに終了時に削除する
+    
+    Args:
+        client (OpenAI): OpenAIクライアント
+        papers (list): 論文ごとの辞書（arxiv_id, title, text）のリスト
+        prompt_template (str): プロンプトテンプレート
+        output_dir (str): 要約結果の出力先ディレクトリ
+        work_dir (str): バッチ入力ファイル（一時ファイル）の作成先ディレクトリ
+    
+    Returns:
+        dict: arXiv IDごとの生成された要約（失敗した論文は含まれない）
+    """
+    if not papers:
+        return {}
+    
+    input_path = None
+    input_file = None
+    try:
+        # リクエストをJSONLファイルにまとめる（同時に実行中の検索セットと重ならないよう一時ファイルにする）
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=work_dir, prefix='batch_input_',
+                                         suffix='.jsonl', delete=False) as f:
+            input_path = f.name
+            logging.info("バッチ入力ファイルを作成中: %s（%s件）", input_path, len(papers))
+            for paper in papers:
+                request = {
+                    "custom_id": paper['arxiv_id'],
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": build_request_body(build_prompt(paper['text'], prompt_template))
+                }
+                f.write(json.dumps(request, ensure_ascii=False) + "\n")
         
-        # 文字数制限（280文字）
-        original_length = len(post_text)
-        if original_length > 130:
-            post_text = post_text[:277] + "..."
-            logging.info(f"投稿テキストを短縮しました（{original_length}文字 → {len(post_text)}文字）")
-        else:
-            logging.info(f"投稿テキスト作成完了（文字数: {len(post_text)}文字）")
+        # ファイルをアップロードしてバッチを作成
+        with open(input_path, 'rb') as f:
+            input_file = client.files.create(file=f, purpose="batch")
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logging.info("バッチを作成しました: %s", batch.id)
         
-        # 結果を辞書にまとめる
-        result = {
-            "title": paper_title,
-            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "summary": summary_text,
-            "post_text": post_text
-        }
+        # バッチの完了を待つ（指数バックオフでポーリング）
+        start_time = time.time()
+        poll_interval = BATCH_POLL_INTERVAL
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if time.time() - start_time > BATCH_MAX_WAIT:
+                logging.error("バッチの完了待ちがタイムアウトしました。バッチをキャンセルします: %s", batch.id)
+                client.batches.cancel(batch.id)
+                return {}
+            
+            logging.info("バッチの完了を待っています（状態: %s）。%s秒後に再確認します", batch.status, poll_interval)
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, BATCH_MAX_POLL_INTERVAL)
+            batch = client.batches.retrieve(batch.id)
         
-        # arXiv IDがある場合は追加
-        if 'arxiv_id' in locals() or 'arxiv_id' in globals():
-            result["arxiv_id"] = arxiv_id
+        if batch.status != "completed" or not batch.output_file_id:
+            logging.error("バッチが完了しませんでした: %s（状態: %s）", batch.id, batch.status)
+            return {}
+        logging.info("バッチが完了しました: %s（所要時間: %.2f秒）", batch.id, time.time() - start_time)
         
-        # 結果をJSONファイルに保存
-        logging.info(f"要約結果をファイルに保存中: {output_path}")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        # 結果ファイルを取得して要約を保存
+        titles = {paper['arxiv_id']: paper['title'] for paper in papers}
+        results = {}
+        output_text = client.files.content(batch.output_file_id).text
+        for line in output_text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            arxiv_id = item.get('custom_id')
+            response = item.get('response') or {}
+            if arxiv_id not in titles or item.get('error') or response.get('status_code') != 200:
+                logging.error("バッチ内の要約生成エラー: %s - %s", arxiv_id, item.get('error') or response.get('status_code'))
+                continue
+            
+            try:
+                summary_text = response['body']['choices'][0]['message']['content'].strip()
+                output_path = get_summary_output_path(output_dir, titles[arxiv_id], arxiv_id)
+                results[arxiv_id] = save_summary_result(summary_text, output_path, titles[arxiv_id], arxiv_id)
+            except Exception as e:
+                logging.error("要約生成エラー: %s - %s", arxiv_id, e)
         
-        logging.info(f"要約生成・保存完了: {output_path}")
-        return result
+        logging.info("バッチで%s/%s件の要約を生成しました", len(results), len(papers))
+        return results
     
     except Exception as e:
-        logging.error(f"要約生成エラー: {str(e)}")
-        return None
\ No newline at end of file
+        logging.error("バッチ要約生成エラー: %s", e)
+        return {}
+    
+    finally:
+        # 論文テキストを含む入力ファイルを削除（ローカルとアップロード先の両方）
+        if input_path:
+            try:
+                os.remove(input_path)
+            except OSError as e:
+                logging.warning("バッチ入力ファイルの削除に失敗しました: %s - %s", input_path, e)
+        if input_file is not None:
+            try:
+                client.files.delete(input_file.id)
+            except Exception as e:
+                logging.warning("アップロードしたバッチ入力ファイルの削除に失敗しました: %s - %s", input_file.id, e)
\ No newline at end of file
@@ -4,43 +4,97 @@
 import arxiv
 import requests
 import os
-import sys
 import time
 import argparse
 import yaml
 import logging
-import json
 import tweepy
 import glob
 import shutil
+import threading
+import hashlib
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urlparse
 from openai import OpenAI
 
 # 追加モジュールをインポート
 from pdf_processor import extract_text_from_pdf
-from ai_summarizer import generate_summary
+from ai_summarizer import generate_summary, generate_summaries_batch
 from twitter_poster import post_thread
+from json_utils import dump_json
+from processed_store import (
+    open_processed_db, contains_processed_id, filter_processed_ids, add_processed_ids,
+    claim_processed_id, release_processed_ids, release_stale_claims
+)
+
+# libyamlがあればCで実装されたローダーを使う（なければPure Python版）
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# ログフォーマット（メインプロセスとワーカープロセスで共通）
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# プロセスごとのOpenAIクライアント（get_openai_clientで初期化）
+_openai_client = None
+
+# 論文を並列処理するワーカープロセス数のデフォルト
+# 処理時間の大半はOpenAIの応答待ちのため、CPUコア数ではなく少数に固定する（同時リクエストによる429を避ける）
+DEFAULT_WORKERS = 2
+
+# arXivへのリクエスト間隔（秒）。arXiv APIの利用規約では3秒に1リクエストまで
+ARXIV_REQUEST_INTERVAL = 3.0
+
+# 前回arXivにリクエストした時刻（wait_for_arxiv_rate_limitで更新）
+_arxiv_rate_lock = threading.Lock()
+_last_arxiv_request = 0.0
+
+# arXiv検索APIの1ページ分の取得を試行する回数の上限（初回を含む）
+ARXIV_SEARCH_ATTEMPTS = 4
+
+# PDFダウンロード用のHTTPセッション（接続を使い回し、429/5xxはバックオフ付きで再試行）
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": "ArXivTweetBot/1.0"})
+_SESSION_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=2, status_forcelist=[429, 500, 502, 503, 504])
+)
+_SESSION.mount("https://", _SESSION_ADAPTER)
+_SESSION.mount("http://", _SESSION_ADAPTER)
+
+# arXiv検索結果のキャッシュの有効期間（秒）
+SEARCH_CACHE_TTL = 3600
+
+# このスクリプトのディレクトリ（設定ファイルやデータディレクトリの基準）
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 def load_config():
     """
     設定ファイルを読み込む
     """
-    config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml')
+    config_path = os.path.join(_SCRIPT_DIR, 'config.yaml')
     with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=YamlLoader)
 
 def setup_directories():
     """
     必要なディレクトリを作成
     """
-    base_dir = os.path.dirname(os.path.abspath(__file__))
+    base_dir = _SCRIPT_DIR
     dirs = {
         'dl': os.path.join(base_dir, 'dl'),
         'text': os.path.join(base_dir, 'text'),
         'summary': os.path.join(base_dir, 'summary'),
         'processed': os.path.join(base_dir, 'processed'),
-        'logs': os.path.join(base_dir, 'logs')
+        'logs': os.path.join(base_dir, 'logs'),
+        'cache': os.path.join(base_dir, 'cache')
     }
     
     for dir_name, dir_path in dirs.items():
@@ -52,18 +106,33 @@ def setup_logging(log_dir, verbose=False):
     """
     ロギングを設定
     
+    他のスクリプト（run_multiple_searches.py）から呼び出され、ロギングが設定済みの場合は、
+    呼び出したスレッドのログだけをこの実行のログファイルにも出力するハンドラーを追加する。
+    このハンドラーのレベルはverboseに従うが、ルートロガーのレベルより詳細なログは出力されない
+    （DEBUGのログを出力するには、呼び出し元もDEBUGレベルに設定する必要がある）
+    
     Args:
         log_dir (str): ログディレクトリのパス
         verbose (bool): 詳細モードかどうか
+    
+    Returns:
+        tuple: (ログファイルのパス, 追加したハンドラー（teardown_loggingで外す。追加しなかった場合はNone）)
     """
     log_file = os.path.join(log_dir, f"arxiv_downloader_{time.strftime('%Y%m%d_%H%M%S')}.log")
     
+    root_logger = logging.getLogger()
+    if root_logger.handlers:
+        handler = logging.FileHandler(log_file)
+        handler.setLevel(logging.DEBUG if verbose else logging.INFO)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        thread_id = threading.get_ident()
+        handler.addFilter(lambda record: record.thread == thread_id)
+        root_logger.addHandler(handler)
+        return log_file, handler
+    
     # ログレベルを設定
     log_level = logging.DEBUG if verbose else logging.INFO
     
-    # ログフォーマットを設定
-    log_format = '%(asctime)s - %(levelname)s - %(message)s'
-    
     # ログハンドラーを設定
     handlers = [
         logging.FileHandler(log_file),
@@ -73,28 +142,135 @@ def setup_logging(log_dir, verbose=False):
     # ロギングを設定
     logging.basicConfig(
         level=log_level,
-        format=log_format,
+        format=LOG_FORMAT,
         handlers=handlers
     )
     
     if verbose:
         logging.info("詳細モードで実行します")
+    
+    return log_file, None
 
-def is_processed(arxiv_id, processed_dir, processed_ids=None):
+def teardown_logging(handler):
+    """
+    setup_loggingで追加したハンドラーを外して閉じる
+    
+    Args:
+        handler (logging.Handler): setup_loggingが返したハンドラー（Noneの場合は何もしない）
+    """
+    if handler is None:
+        return
+    logging.getLogger().removeHandler(handler)
+    handler.close()
+
+def init_worker(log_file, verbose=False):
+    """
+    ワーカープロセスを初期化する（メインプロセスと同じログファイルに出力する）
+    
+    Args:
+        log_file (str): ログファイルのパス
+        verbose (bool): 詳細モードかどうか
+    """
+    if logging.getLogger().handlers:
+        return
+    
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format=LOG_FORMAT,
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
+
+def get_openai_client(config):
+    """
+    OpenAIクライアントを取得する（プロセスごとに一度だけ初期化）
+    
+    Args:
+        config (dict): 設定情報
+        
+    Returns:
+        OpenAI: OpenAIクライアント
+    """
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = OpenAI(api_key=config['openai']['api_key'])
+    return _openai_client
+
+def wait_for_arxiv_rate_limit():
+    """
+    前回のarXivへのリクエストからARXIV_REQUEST_INTERVAL秒経過するまで待機する
+    
+    固定時間のsleepと違い、前回のリクエスト以降に経過した時間（ダウンロード自体にかかった時間など）は
+    待機時間から差し引かれる
+    """
+    global _last_arxiv_request
+    with _arxiv_rate_lock:
+        wait_time = _last_arxiv_request + ARXIV_REQUEST_INTERVAL - time.monotonic()
+        if wait_time > 0:
+            logging.debug("arXivのレート制限のため%.2f秒待機します", wait_time)
+            time.sleep(wait_time)
+        _last_arxiv_request = time.monotonic()
+
+class RateLimitedArxivClient(arxiv.Client):
+    """
+    検索APIの各ページ取得をwait_for_arxiv_rate_limitで制限するarXivクライアント
+    
+    arxiv.Clientのdelay_secondsはインスタンスごとにしか効かないため、
+    並列に実行される検索セットやPDFダウンロードと合わせてプロセス全体で間隔を空ける
+    """
+    
+    def _parse_feed(self, url, first_page=True):
+        for attempt in range(1, ARXIV_SEARCH_ATTEMPTS + 1):
+            wait_for_arxiv_rate_limit()
+            try:
+                return super()._parse_feed(url, first_page)
+            except (arxiv.HTTPError, arxiv.UnexpectedEmptyPageError) as e:
+                if attempt == ARXIV_SEARCH_ATTEMPTS:
+                    raise
+                logging.warning("arXiv検索APIの取得に失敗したため再試行します（%s/%s）: %s", attempt, ARXIV_SEARCH_ATTEMPTS, e)
+
+# arXiv検索用のクライアント（待機と再試行はRateLimitedArxivClient側で行う）
+_ARXIV_CLIENT = RateLimitedArxivClient(
+    page_size=10,  # 一度に取得する論文数を制限
+    delay_seconds=0,
+    num_retries=0
+)
+
+def load_processed_dir(processed_dir):
+    """
+    処理済みファイルのディレクトリを一度だけ走査し、処理済み論文IDのセットを作成
+    
+    Args:
+        processed_dir (str): 処理済みファイルのディレクトリ
+        
+    Returns:
+        set: 処理済み論文IDのセット
+    """
+    with os.scandir(processed_dir) as entries:
+        return {entry.name[:-5] for entry in entries if entry.name.endswith('.json')}
+
+def is_processed(arxiv_id, processed_dir, processed_ids=None, processed_db=None):
     """
     論文が既に処理済みかどうかを確認
     
     Args:
         arxiv_id (str): 論文のarXiv ID
         processed_dir (str): 処理済みファイルのディレクトリ
-        processed_ids (set, optional): 処理済み論文IDのセット
+        processed_ids (set, optional): 処理済み論文IDのセット（load_processed_dirの結果を含むこと）
+        processed_db (sqlite3.Connection, optional): 処理済み論文IDのデータベース
         
     Returns:
         bool: 処理済みかどうか
     """
-    # 処理済みIDリストに含まれているかチェック
-    if processed_ids and arxiv_id in processed_ids:
+    # 処理済みIDのデータベースに含まれているかチェック
+    if processed_db is not None and contains_processed_id(processed_db, arxiv_id):
         return True
+    
+    # 処理済みIDのセットがある場合はファイルを確認せずに判定
+    if processed_ids is not None:
+        return arxiv_id in processed_ids
         
     # 処理済みファイルが存在するかチェック
     processed_file = os.path.join(processed_dir, f"{arxiv_id}.json")
@@ -111,8 +287,7 @@ def mark_as_processed(arxiv_id, paper_title, processed_dir):
         "processed_at": time.strftime("%Y-%m-%d %H:%M:%S")
     }
     
-    with open(processed_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    dump_json(data, processed_file)
 
 def extract_arxiv_id(paper):
     """
@@ -124,29 +299,67 @@ def extract_arxiv_id(paper):
     Returns:
         str: arXiv ID
     """
-    pdf_url = paper.pdf_url
-    parsed_url = urlparse(pdf_url)
-    path_parts = parsed_url.path.split('/')
-    arxiv_id = path_parts[-1]
+    # PDFのURL（http://arxiv.org/pdf/<ID>）の最後の要素がarXiv ID
+    arxiv_id = paper.pdf_url.rsplit('/', 1)[-1]
     if arxiv_id.endswith('.pdf'):
         arxiv_id = arxiv_id[:-4]
     return arxiv_id
 
-def search_arxiv(keywords, max_results=100, use_or=False, since_timestamp=None, last_paper_id=None):
+def load_search_cache(cache_path):
+    """
+    キャッシュされたarXiv検索結果を読み込む（有効期間切れや読み込みエラーの場合はNone）
+    
+    Args:
+        cache_path (str): キャッシュファイルのパス
+    
+    Returns:
+        list: 検索結果の論文リスト
+    """
+    try:
+        if time.time() - os.path.getmtime(cache_path) > SEARCH_CACHE_TTL:
+            return None
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.warning("検索結果キャッシュの読み込みに失敗しました: %s - %s", cache_path, e)
+        return None
+
+def save_search_cache(cache_path, results):
+    """
+    arXiv検索結果をキャッシュに保存する
+    
+    Args:
+        cache_path (str): キャッシュファイルのパス
+        results (list): 検索結果の論文リスト
+    """
+    try:
+        partial_path = f"{cache_path}.part"
+        with open(partial_path, 'wb') as f:
+            pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial_path, cache_path)
+    except Exception as e:
+        logging.warning("検索結果キャッシュの保存に失敗しました: %s - %s", cache_path, e)
+
+def search_arxiv(keywords, max_results=100, use_or=False, since_timestamp=None, last_paper_id=None, cache_dir=None):
     """
     arXivで指定されたキーワードを使用して論文を検索します。
     
+    cache_dirを指定した場合、同じクエリの検索結果をSEARCH_CACHE_TTL秒の間再利用します。
+    
     Args:
         keywords (list): 検索キーワードのリスト
         max_results (int): 取得する最大論文数
         use_or (bool): キーワードをORで結合するかどうか
         since_timestamp (str, optional): 指定したタイムスタンプ以降の論文のみを検索
         last_paper_id (str, optional): 指定したID以降の論文のみを検索
+        cache_dir (str, optional): 検索結果のキャッシュディレクトリ（省略時はキャッシュしない）
     
     Returns:
         list: 検索結果の論文リスト
     """
-    logging.info(f"キーワード '{' '.join(keywords)}' でarXivを検索中...")
+    logging.info("キーワード '%s' でarXivを検索中...", ' '.join(keywords))
     
     # 検索クエリを作成
     if use_or:
@@ -158,37 +371,41 @@ def search_arxiv(keywords, max_results=100, use_or=False, since_timestamp=None,
     if since_timestamp:
         date_filter = f" AND submittedDate:[{since_timestamp} TO *]"
         query += date_filter
-        logging.info(f"タイムスタンプフィルタを適用: {since_timestamp} 以降")
-    
-    # arXivクライアントを作成
-    client = arxiv.Client(
-        page_size=10,  # 一度に取得する論文数を制限
-        delay_seconds=3.0,  # リクエスト間の待機時間を3秒に設定
-        num_retries=3  # リトライ回数
-    )
+        logging.info("タイムスタンプフィルタを適用: %s 以降", since_timestamp)
     
-    # 検索オブジェクトを作成
-    search = arxiv.Search(
-        query=query,
-        max_results=max_results,
-        sort_by=arxiv.SortCriterion.SubmittedDate
-    )
+    # キャッシュを確認
+    results = None
+    cache_path = None
+    if cache_dir:
+        cache_key = hashlib.blake2b(f"{query}\n{max_results}".encode('utf-8'), digest_size=16).hexdigest()
+        cache_path = os.path.join(cache_dir, f"search_{cache_key}.pkl")
+        results = load_search_cache(cache_path)
+        if results is not None:
+            logging.info("キャッシュされた検索結果を使用します: %s", cache_path)
     
-    # 結果を取得
-    results = list(client.results(search))
+    if results is None:
+        # 検索オブジェクトを作成
+        search = arxiv.Search(
+            query=query,
+            max_results=max_results,
+            sort_by=arxiv.SortCriterion.SubmittedDate
+        )
+        
+        # 結果を取得（各ページのリクエストはwait_for_arxiv_rate_limitで間隔を空ける）
+        results = list(_ARXIV_CLIENT.results(search))
+        
+        if cache_path:
+            save_search_cache(cache_path, results)
     
     # 最後に処理した論文ID以降の論文のみをフィルタリング
+    # 検索結果の順番（投稿日の新しい順）はそのまま保つ
     if last_paper_id:
-        filtered_results = []
-        for paper in results:
-            paper_id = extract_arxiv_id(paper)
-            if paper_id > last_paper_id:
-                filtered_results.append(paper)
+        filtered_results = [paper for paper in results if extract_arxiv_id(paper) > last_paper_id]
         
-        logging.info(f"{len(results)}件の論文が見つかり、ID {last_paper_id} 以降の {len(filtered_results)}件をフィルタリングしました。")
+        logging.info("%s件の論文が見つかり、ID %s 以降の %s件をフィルタリングしました。", len(results), last_paper_id, len(filtered_results))
         return filtered_results
     
-    logging.info(f"{len(results)}件の論文が見つかりました。")
+    logging.info("%s件の論文が見つかりました。", len(results))
     return results
 
 def download_pdf(paper, download_dir, force_download=False):
@@ -221,95 +438,80 @@ def download_pdf(paper, download_dir, force_download=False):
     
     # 既にファイルが存在する場合はスキップ（force_downloadがFalseの場合）
     if os.path.exists(download_path) and not force_download:
-        logging.info(f"ファイル {arxiv_id} は既に存在します。スキップします。")
+        logging.info("ファイル %s は既に存在します。スキップします。", arxiv_id)
         return True, download_path, arxiv_id_without_ext
     
     try:
         # PDFをダウンロード
-        logging.info(f"ダウンロード中: {paper.title} ({arxiv_id})")
-        
-        # arXivサーバーに負荷をかけないよう、ダウンロード前に待機
-        time.sleep(5)  # 5秒待機
-        
-        response = requests.get(pdf_url)
-        response.raise_for_status()
+        logging.info("ダウンロード中: %s (%s)", paper.title, arxiv_id)
         
-        # ファイルに保存
-        with open(download_path, 'wb') as f:
-            f.write(response.content)
+        # arXivサーバーに負荷をかけないよう、リクエスト間隔を空ける
+        wait_for_arxiv_rate_limit()
         
-        logging.info(f"ダウンロード完了: {download_path}")
+        # レスポンス全体をメモリに載せず、一時ファイルへストリーミングで保存
+        # （途中で失敗しても不完全なPDFが「ダウンロード済み」と扱われないよう、完了後にリネーム）
+        partial_path = f"{download_path}.part"
+        with _SESSION.get(pdf_url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with open(partial_path, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=65536)
+        os.replace(partial_path, download_path)
         
-        # ダウンロード後も少し待機
-        time.sleep(2)  # 2秒待機
+        logging.info("ダウンロード完了: %s", download_path)
         
         return True, download_path, arxiv_id_without_ext
     
     except Exception as e:
-        logging.error(f"ダウンロード失敗: {arxiv_id} - エラー: {str(e)}")
+        logging.error("ダウンロード失敗: %s - エラー: %s", arxiv_id, e)
+        if os.path.exists(f"{download_path}.part"):
+            os.remove(f"{download_path}.part")
         return False, None, arxiv_id_without_ext
 
-def process_paper(paper, dirs, openai_client, config, force_process=False, skip_twitter=False):
+def prepare_paper_text(paper, dirs):
     """
-    論文を処理する（ダウンロード、テキスト抽出、要約生成、Twitter投稿）
+    論文のPDFをダウンロードし、テキストを抽出する
     
     Args:
         paper (arxiv.Result): 論文情報
         dirs (dict): ディレクトリパス
-        openai_client (OpenAI): OpenAIクライアント
-        config (dict): 設定情報
-        force_process (bool): 処理済みの論文も強制的に処理するかどうか
-        skip_twitter (bool): Twitter投稿をスキップするかどうか
     
     Returns:
-        bool: 処理が成功したかどうか
+        tuple: (arXiv ID, 論文テキスト)（失敗した場合は(None, None)）
     """
     # 1. PDFをダウンロード
-    logging.info(f"論文 '{paper.title}' のPDFをダウンロード中...")
+    logging.info("論文 '%s' のPDFをダウンロード中...", paper.title)
     start_time = time.time()
     success, pdf_path, arxiv_id = download_pdf(paper, dirs['dl'])
     end_time = time.time()
     if not success:
-        logging.error(f"論文 '{paper.title}' のPDFダウンロードに失敗しました")
-        return False
-    logging.info(f"論文 '{paper.title}' のPDFダウンロードが完了しました（所要時間: {end_time - start_time:.2f}秒）")
+        logging.error("論文 '%s' のPDFダウンロードに失敗しました", paper.title)
+        return None, None
+    logging.info("論文 '%s' のPDFダウンロードが完了しました（所要時間: %.2f秒）", paper.title, end_time - start_time)
     
-    # 2. 処理済みかどうかを確認
-    if is_processed(arxiv_id, dirs['processed']) and not force_process:
-        logging.info(f"論文 {arxiv_id} は既に処理済みです。スキップします。")
-        return True
-    
-    # 3. PDFからテキストを抽出
-    logging.info(f"論文 '{paper.title}' のテキスト抽出中...")
+    # 2. PDFからテキストを抽出
+    logging.info("論文 '%s' のテキスト抽出中...", paper.title)
     start_time = time.time()
-    text_path = extract_text_from_pdf(pdf_path, dirs['text'])
+    paper_text, _ = extract_text_from_pdf(pdf_path, dirs['text'])
     end_time = time.time()
-    if not text_path:
-        logging.error(f"論文 '{paper.title}' のテキスト抽出に失敗しました")
-        return False
-    logging.info(f"論文 '{paper.title}' のテキスト抽出が完了しました（所要時間: {end_time - start_time:.2f}秒）")
+    if paper_text is None:
+        logging.error("論文 '%s' のテキスト抽出に失敗しました", paper.title)
+        return None, None
+    logging.info("論文 '%s' のテキスト抽出が完了しました（所要時間: %.2f秒）", paper.title, end_time - start_time)
     
-    # 4. テキストを読み込み
-    with open(text_path, 'r', encoding='utf-8') as f:
-        paper_text = f.read()
-    # 5. 要約を生成
-    logging.info(f"論文 '{paper.title}' の要約を生成中...")
-    start_time = time.time()
-    summary = generate_summary(
-        openai_client,
-        paper_text,
-        config['prompt']['template'],
-        dirs['summary'],
-        paper.title,
-        arxiv_id
-    )
-    end_time = time.time()
-    if not summary:
-        logging.error(f"論文 '{paper.title}' の要約生成に失敗しました")
-        return False
+    return arxiv_id, paper_text
+
+def add_post_text(summary, arxiv_id):
+    """
+    要約にarXiv IDを追加し、投稿テキストがない場合は生成する
     
-    logging.info(f"論文 '{paper.title}' の要約生成が完了しました（所要時間: {end_time - start_time:.2f}秒）")
+    Args:
+        summary (dict): 生成された要約
+        arxiv_id (str): arXiv ID
     
+    Returns:
+        dict: arXiv IDと投稿テキストを追加した要約
+    """
     # arXiv IDを追加
     summary['arxiv_id'] = arxiv_id
     
@@ -326,14 +528,129 @@ def process_paper(paper, dirs, openai_client, config, force_process=False, skip_
         
         summary['post_text'] = post_text
     
-    # 6. Twitterに投稿（スキップオプションがない場合のみ）
+    return summary
+
+def process_paper_no_tweet(paper, dirs, config, openai_client=None):
+    """
+    論文を処理する（ダウンロード、テキスト抽出、要約生成）。Twitter投稿は行わない
+    
+    ワーカープロセスからも呼び出せるよう、引数はすべてpickle可能な値にしている
+    
+    Args:
+        paper (arxiv.Result): 論文情報
+        dirs (dict): ディレクトリパス
+        config (dict): 設定情報
+        openai_client (OpenAI, optional): OpenAIクライアント（省略時はプロセスごとに生成）
+    
+    Returns:
+        dict: 生成された要約（失敗した場合はNone）
+    """
+    arxiv_id, paper_text = prepare_paper_text(paper, dirs)
+    if paper_text is None:
+        return None
+    
+    # 4. 要約を生成
+    logging.info("論文 '%s' の要約を生成中...", paper.title)
+    start_time = time.time()
+    summary = generate_summary(
+        openai_client or get_openai_client(config),
+        paper_text,
+        config['prompt']['template'],
+        dirs['summary'],
+        paper.title,
+        arxiv_id
+    )
+    end_time = time.time()
+    if not summary:
+        logging.error("論文 '%s' の要約生成に失敗しました", paper.title)
+        return None
+    
+    logging.info("論文 '%s' の要約生成が完了しました（所要時間: %.2f秒）", paper.title, end_time - start_time)
+    
+    return add_post_text(summary, arxiv_id)
+
+def process_papers_batch(papers, dirs, config, skip_twitter=False, failed_ids=None, processed_db=None):
+    """
+    OpenAIのBatch APIで複数の論文をまとめて処理する（最後の論文のみTwitterに投稿する）
+    
+    要約がそろうまで時間がかかるため、すぐに投稿する必要がない定期実行向け
+    
+    Args:
+        papers (list): 処理する論文のリスト
+        dirs (dict): ディレクトリパス
+        config (dict): 設定情報
+        skip_twitter (bool): Twitter投稿をスキップするかどうか
+        failed_ids (set, optional): 処理に失敗した論文IDを追加するセット
+        processed_db (sqlite3.Connection, optional): 処理済み論文IDのデータベース
+    
+    Returns:
+        bool: 最後の論文の処理が成功したかどうか
+    """
+    # 1. 各論文のテキストを準備
+    items = []
+    for paper in papers:
+        arxiv_id, paper_text = prepare_paper_text(paper, dirs)
+        if paper_text is not None:
+            items.append({'arxiv_id': arxiv_id, 'title': paper.title, 'text': paper_text})
+    
+    # 2. Batch APIで要約をまとめて生成
+    summaries = generate_summaries_batch(
+        get_openai_client(config),
+        items,
+        config['prompt']['template'],
+        dirs['summary'],
+        dirs['summary']
+    )
+    
+    # 3. 元の順番で投稿（最後の論文以外はTwitter投稿をスキップ）
+    success = False
+    for i, paper in enumerate(papers, 1):
+        is_last_paper = (i == len(papers))
+        arxiv_id = extract_arxiv_id(paper)
+        summary = summaries.get(arxiv_id)
+        if not summary:
+            logging.error("論文 '%s' の要約生成に失敗しました", paper.title)
+            if failed_ids is not None:
+                failed_ids.add(arxiv_id)
+            continue
+        
+        result = publish_summary(paper, add_post_text(summary, arxiv_id), dirs, config,
+                                 skip_twitter or not is_last_paper, processed_db)
+        if not result and failed_ids is not None:
+            failed_ids.add(arxiv_id)
+        logging.info("論文 %s/%s: %s - 処理完了", i, len(papers), paper.title)
+        if is_last_paper:
+            success = result
+    
+    return success
+
+def publish_summary(paper, summary, dirs, config, skip_twitter=False, processed_db=None):
+    """
+    要約をTwitterに投稿し（スキップ時はログのみ保存）、論文を処理済みとしてマークする
+    
+    processed_dbを指定した場合は、処理中として登録した論文IDを処理済みに確定する
+    
+    Args:
+        paper (arxiv.Result): 論文情報
+        summary (dict): process_paper_no_tweetが返した要約
+        dirs (dict): ディレクトリパス
+        config (dict): 設定情報
+        skip_twitter (bool): Twitter投稿をスキップするかどうか
+        processed_db (sqlite3.Connection, optional): 処理済み論文IDのデータベース
+    
+    Returns:
+        bool: 処理が成功したかどうか
+    """
+    arxiv_id = summary['arxiv_id']
+    
+    # Twitterに投稿（スキップオプションがない場合のみ）
     if not skip_twitter:
         success = post_thread(config['twitter'], summary, dirs['logs'])
         if not success:
-            logging.error(f"Twitter投稿に失敗しました。処理を中止します: {paper.title}")
+            logging.error("Twitter投稿に失敗しました。処理を中止します: %s", paper.title)
             return False
     else:
-        logging.info(f"Twitter投稿をスキップしました: {paper.title}")
+        logging.info("Twitter投稿をスキップしました: %s", paper.title)
         
         # Twitter投稿をスキップした場合も、ログファイルを生成
         log_path = os.path.join(dirs['logs'], f"{arxiv_id}_twitter_log.json")
@@ -346,50 +663,112 @@ def process_paper(paper, dirs, openai_client, config, force_process=False, skip_
             "tweets": []
         }
         
-        with open(log_path, 'w', encoding='utf-8') as f:
-            json.dump(log_data, f, ensure_ascii=False, indent=2)
+        dump_json(log_data, log_path)
     
-    # 7. 処理済みとしてマーク
+    # 処理済みとしてマーク
     mark_as_processed(arxiv_id, paper.title, dirs['processed'])
+    if processed_db is not None:
+        add_processed_ids(processed_db, [arxiv_id])
     
     return True
 
-def copy_pdf_if_exists(arxiv_id, target_dir):
+def process_paper(paper, dirs, openai_client, config, force_process=False, skip_twitter=False):
+    """
+    論文を処理する（ダウンロード、テキスト抽出、要約生成、Twitter投稿）
+    
+    Args:
+        paper (arxiv.Result): 論文情報
+        dirs (dict): ディレクトリパス
+        openai_client (OpenAI): OpenAIクライアント
+        config (dict): 設定情報
+        force_process (bool): 処理済みの論文も強制的に処理するかどうか
+        skip_twitter (bool): Twitter投稿をスキップするかどうか
+    
+    Returns:
+        bool: 処理が成功したかどうか
+    """
+    # 処理済みかどうかを確認
+    arxiv_id = extract_arxiv_id(paper)
+    if is_processed(arxiv_id, dirs['processed']) and not force_process:
+        logging.info("論文 %s は既に処理済みです。スキップします。", arxiv_id)
+        return True
+    
+    summary = process_paper_no_tweet(paper, dirs, config, openai_client)
+    if not summary:
+        return False
+    
+    return publish_summary(paper, summary, dirs, config, skip_twitter)
+
+def build_pdf_index(pdf_root='./pdf'):
+    """
+    他の検索セットでダウンロード済みのPDFを一度だけ走査し、arXiv IDからパスへの索引を作成
+    
+    Args:
+        pdf_root (str): 検索セットごとのPDFディレクトリの親ディレクトリ
+        
+    Returns:
+        dict: arXiv IDをキー、PDFファイルのパスを値とする辞書
+    """
+    pdf_index = {}
+    for pdf_dir in glob.glob(os.path.join(pdf_root, '*')):
+        if not os.path.isdir(pdf_dir):
+            continue
+        with os.scandir(pdf_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.pdf') and entry.is_file():
+                    pdf_index.setdefault(entry.name[:-4], entry.path)
+    return pdf_index
+
+def copy_pdf_if_exists(arxiv_id, target_dir, pdf_index=None):
     """
     他の検索セットで既にダウンロードされたPDFをコピー
     
+    同じファイルシステム上であればハードリンクを作成し、PDFの中身はコピーしない
+    
     Args:
         arxiv_id (str): 論文のarXiv ID
         target_dir (str): コピー先ディレクトリ
+        pdf_index (dict, optional): build_pdf_indexで作成した索引（省略時は作成する）
         
     Returns:
         bool: コピーが成功したかどうか
     """
-    # 全てのPDFディレクトリを検索
-    pdf_dirs = glob.glob('./pdf/*')
-    pdf_filename = f"{arxiv_id}.pdf"
-    
-    for pdf_dir in pdf_dirs:
-        source_path = os.path.join(pdf_dir, pdf_filename)
-        if os.path.exists(source_path) and os.path.isfile(source_path):
-            target_path = os.path.join(target_dir, pdf_filename)
-            # 既にターゲットディレクトリに存在する場合はスキップ
-            if os.path.exists(target_path):
-                return True
-                
-            try:
-                shutil.copy2(source_path, target_path)
-                logging.info(f"PDFをコピーしました: {source_path} -> {target_path}")
-                return True
-            except Exception as e:
-                logging.error(f"PDFのコピーに失敗しました: {str(e)}")
-                return False
+    if pdf_index is None:
+        pdf_index = build_pdf_index()
+    
+    source_path = pdf_index.get(arxiv_id)
+    if not source_path:
+        return False
+    
+    target_path = os.path.join(target_dir, f"{arxiv_id}.pdf")
+    # 既にターゲットディレクトリに存在する場合はスキップ
+    if os.path.exists(target_path):
+        return True
     
-    return False
+    try:
+        try:
+            os.link(source_path, target_path)
+            logging.info("PDFのハードリンクを作成しました: %s -> %s", source_path, target_path)
+        except OSError:
+            # 別のファイルシステムなどでハードリンクを作成できない場合はコピー
+            shutil.copy2(source_path, target_path)
+            logging.info("PDFをコピーしました: %s -> %s", source_path, target_path)
+        return True
+    except Exception as e:
+        logging.error("PDFのコピーに失敗しました: %s", e)
+        return False
 
-def main():
+def main(argv=None, processed_db=None):
     """
     メイン関数
+    
+    Args:
+        argv (list, optional): コマンドライン引数（省略時はsys.argvを使用）
+        processed_db (sqlite3.Connection, optional): 開いている処理済み論文IDのデータベース
+            （同じプロセス内から呼び出す場合に--processed-ids-dbの代わりに渡す）
+    
+    Returns:
+        set: 新しく処理した論文IDのセット
     """
     # コマンドライン引数のパーサーを設定
     parser = argparse.ArgumentParser(
@@ -442,6 +821,11 @@ def main():
         type=str,
         help='ログディレクトリのパス（指定しない場合はデフォルトの logs/ を使用）'
     )
+    parser.add_argument(
+        '--pdf-dir',
+        type=str,
+        help='PDFのダウンロード先ディレクトリのパス（指定しない場合はデフォルトの dl/ を使用）'
+    )
     parser.add_argument(
         '--since-timestamp',
         type=str,
@@ -457,6 +841,11 @@ def main():
         type=str,
         help='処理済み論文IDのリストファイル'
     )
+    parser.add_argument(
+        '--processed-ids-db',
+        type=str,
+        help='処理済み論文IDのデータベース（SQLite）ファイル'
+    )
     parser.add_argument(
         '--output-processed-ids',
         type=str,
@@ -467,9 +856,20 @@ def main():
         action='store_true',
         help='詳細な出力を表示します'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'論文を並列処理するワーカープロセス数（デフォルト: {DEFAULT_WORKERS}）'
+    )
+    parser.add_argument(
+        '--batch-mode',
+        action='store_true',
+        help='OpenAIのBatch APIでまとめて要約を生成します（料金は半額、完了まで最大24時間）'
+    )
     
     # 引数を解析
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # ディレクトリを設定
     dirs = setup_directories()
@@ -480,24 +880,149 @@ def main():
         os.makedirs(log_dir, exist_ok=True)
         dirs['logs'] = log_dir
     
+    # カスタムPDFディレクトリが指定されている場合は使用
+    if args.pdf_dir:
+        os.makedirs(args.pdf_dir, exist_ok=True)
+        dirs['dl'] = os.path.abspath(args.pdf_dir)
+    
     # ロギングを設定
-    setup_logging(dirs['logs'], args.verbose)
+    log_file, log_handler = setup_logging(dirs['logs'], args.verbose)
+    try:
+        return run(args, dirs, log_file, processed_db)
+    finally:
+        teardown_logging(log_handler)
+
+def process_selected_papers(papers_to_process, dirs, config, args, log_file, failed_ids, processed_db=None):
+    """
+    選定した論文を処理する（最後の論文のみTwitterに投稿する）
+    
+    Args:
+        papers_to_process (list): 処理する論文のリスト
+        dirs (dict): ディレクトリパス
+        config (dict): 設定情報
+        args (argparse.Namespace): コマンドライン引数
+        log_file (str): ログファイルのパス（ワーカープロセスも同じファイルに出力する）
+        failed_ids (set): 処理に失敗した論文IDを追加するセット
+        processed_db (sqlite3.Connection, optional): 処理済み論文IDのデータベース
+    
+    Returns:
+        bool: 最後の論文の処理が成功したかどうか
+    """
+    total_count = len(papers_to_process)
+    last_paper = papers_to_process[-1]
+    if args.batch_mode:
+        # Batch APIでまとめて処理する
+        logging.info("%s件の論文をBatch APIでまとめて処理します", total_count)
+        success = process_papers_batch(papers_to_process, dirs, config, args.skip_twitter, failed_ids, processed_db)
+    else:
+        # 論文を処理（最後の論文以外はTwitter投稿をスキップ）
+        # 最後の論文以外はワーカープロセスで並列に処理する（arXivへのアクセスは上のダウンロードで完了済み）
+        other_papers = papers_to_process[:-1]
+        if other_papers:
+            max_workers = max(1, min(args.workers, len(other_papers)))
+            logging.info("%s件の論文を%sプロセスで並列処理します（Twitter投稿はスキップします）", len(other_papers), max_workers)
+            
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_worker,
+                initargs=(log_file, args.verbose)
+            ) as executor:
+                futures = {
+                    executor.submit(process_paper_no_tweet, paper, dirs, config): paper
+                    for paper in other_papers
+                }
+                for done_count, future in enumerate(as_completed(futures), 1):
+                    paper = futures[future]
+                    try:
+                        summary = future.result()
+                    except Exception as e:
+                        logging.error("論文 '%s' の処理中にエラーが発生しました: %s", paper.title, e)
+                        failed_ids.add(extract_arxiv_id(paper))
+                        continue
+                    
+                    if summary:
+                        publish_summary(paper, summary, dirs, config, skip_twitter=True, processed_db=processed_db)
+                    else:
+                        failed_ids.add(extract_arxiv_id(paper))
+                    logging.info("論文 %s/%s: %s - 処理完了", done_count, total_count, paper.title)
+        
+        # 最後の論文はメインプロセスで処理し、Twitterに投稿する
+        if args.skip_twitter:
+            logging.info("論文 %s/%s: %s - Twitter投稿はスキップします", total_count, total_count, last_paper.title)
+        else:
+            logging.info("論文 %s/%s: %s - Twitter投稿を行います", total_count, total_count, last_paper.title)
+        
+        if args.verbose:
+            logging.debug("論文を処理中: %s", last_paper.title)
+        
+        summary = process_paper_no_tweet(last_paper, dirs, config)
+        success = bool(summary) and publish_summary(last_paper, summary, dirs, config, args.skip_twitter, processed_db)
+        if not success:
+            failed_ids.add(extract_arxiv_id(last_paper))
+    
+    return success
+
+def run(args, dirs, log_file, processed_db=None):
+    """
+    論文を検索し、未処理の論文を処理する
+    
+    Args:
+        args (argparse.Namespace): コマンドライン引数
+        dirs (dict): ディレクトリパス
+        log_file (str): ログファイルのパス（ワーカープロセスも同じファイルに出力する）
+        processed_db (sqlite3.Connection, optional): 処理済み論文IDのデータベース（呼び出し元が閉じる）
+    
+    Returns:
+        set: 新しく処理した論文IDのセット
+    """
+    # 呼び出し元から接続が渡されない場合は--processed-ids-dbを開き、終了時に閉じる
+    if processed_db is not None or not args.processed_ids_db:
+        return _run(args, dirs, log_file, processed_db)
+    
+    conn = open_processed_db(args.processed_ids_db)
+    released_count = release_stale_claims(conn)
+    if released_count:
+        logging.info("処理が中断された%s件の論文IDの登録を取り消しました。", released_count)
+    try:
+        return _run(args, dirs, log_file, conn)
+    finally:
+        conn.close()
+
+def _run(args, dirs, log_file, processed_db):
+    """
+    論文を検索し、未処理の論文を処理する（runから呼び出す）
+    
+    処理済み論文IDのデータベースがある場合は、選んだ論文のIDをダウンロード前に処理中として登録し、
+    同時に実行中の他の検索セットが同じ論文を処理（Twitterに投稿）しないようにする。
+    登録はpublish_summaryで処理済みに確定し、処理に失敗した論文の登録は取り消す
     
+    Args:
+        args (argparse.Namespace): コマンドライン引数
+        dirs (dict): ディレクトリパス
+        log_file (str): ログファイルのパス（ワーカープロセスも同じファイルに出力する）
+        processed_db (sqlite3.Connection): 処理済み論文IDのデータベース（Noneの場合は登録しない）
+    
+    Returns:
+        set: 新しく処理した論文IDのセット
+    """
     if args.verbose:
         logging.debug("コマンドライン引数: %s", args)
     
     # 設定を読み込み
     config = load_config()
     
-    # OpenAIクライアントを初期化
-    openai_client = OpenAI(api_key=config['openai']['api_key'])
-    
     # 処理済み論文IDを読み込む
     processed_ids = set()
     if args.processed_ids_file and os.path.exists(args.processed_ids_file):
         with open(args.processed_ids_file, 'r') as f:
-            processed_ids = set(f.read().splitlines())
-        logging.info(f"{len(processed_ids)}件の処理済み論文IDを読み込みました。")
+            # 1行ずつ読み込み、ファイル全体を一度にメモリに載せない
+            processed_ids = {line.rstrip('\n') for line in f}
+            processed_ids.discard('')
+        logging.info("%s件の処理済み論文IDを読み込みました。", len(processed_ids))
+    
+    # 処理済みディレクトリの内容も加える（論文ごとにファイルの存在を確認しないようにする）
+    processed_ids |= load_processed_dir(dirs['processed'])
     
     # arXivを検索
     papers = search_arxiv(
@@ -505,23 +1030,29 @@ def main():
         args.max_results,
         args.use_or,
         args.since_timestamp,
-        args.last_paper_id
+        args.last_paper_id,
+        # --force-downloadの場合はキャッシュを使わずに検索し直す
+        cache_dir=None if args.force_download else dirs['cache']
     )
     
     if not papers:
         logging.info("論文が見つかりませんでした。")
-        sys.exit(0)
+        return set()
+    
+    # 検索結果のうちデータベースに登録済みのIDをまとめて取得する
+    if processed_db is not None:
+        processed_ids |= filter_processed_ids(processed_db, [extract_arxiv_id(paper) for paper in papers])
     
     # 論文情報を表示
     logging.info("\n検索結果:")
     for i, paper in enumerate(papers, 1):
-        logging.info(f"{i}. {paper.title} ({paper.published.year})")
-        if args.verbose and i <= 5:  # 詳細モードでは最初の5件の詳細情報を表示
-            logging.debug(f"  - ID: {paper.entry_id}")
-            logging.debug(f"  - 公開日: {paper.published}")
-            logging.debug(f"  - 更新日: {paper.updated}")
-            logging.debug(f"  - 著者: {', '.join([author.name for author in paper.authors])}")
-            logging.debug(f"  - カテゴリ: {', '.join(paper.categories)}")
+        logging.info("%s. %s (%s)", i, paper.title, paper.published.year)
+        if i <= 5 and logging.getLogger().isEnabledFor(logging.DEBUG):  # 詳細モードでは最初の5件の詳細情報を表示
+            logging.debug("  - ID: %s", paper.entry_id)
+            logging.debug("  - 公開日: %s", paper.published)
+            logging.debug("  - 更新日: %s", paper.updated)
+            logging.debug("  - 著者: %s", ', '.join([author.name for author in paper.authors]))
+            logging.debug("  - カテゴリ: %s", ', '.join(paper.categories))
     
     # 処理する論文の最大数
     max_process_count = 1 if args.test_mode else args.max_process
@@ -529,69 +1060,76 @@ def main():
     # 論文を処理
     logging.info("\n論文の処理を開始します...")
     if args.verbose:
-        logging.debug(f"処理対象の論文数: {len(papers)}")
-        logging.debug(f"最大処理数: {max_process_count}")
+        logging.debug("処理対象の論文数: %s", len(papers))
+        logging.debug("最大処理数: %s", max_process_count)
     processed_count = 0
     papers_to_process = []
     
     # 新しく処理した論文IDを記録するセット
     newly_processed_ids = set()
     
-    # 処理対象の論文を選定
-    for i, paper in enumerate(papers):
-        if processed_count >= max_process_count:
-            break
-        
-        # arXiv IDを抽出
-        arxiv_id = extract_arxiv_id(paper)
-        
-        # 処理済みかどうかを確認
-        if not is_processed(arxiv_id, dirs['processed'], processed_ids) or args.force_process:
-            # PDFが他のディレクトリに存在するかチェックし、存在する場合はコピー
-            if not copy_pdf_if_exists(arxiv_id, dirs['dl']):
-                # コピーできなかった場合はダウンロード
-                success, _, _ = download_pdf(paper, dirs['dl'])
-                if not success:
-                    continue
-            
-            papers_to_process.append(paper)
-            newly_processed_ids.add(arxiv_id)
-            processed_count += 1
+    # この実行でデータベースに登録した論文IDと、処理に失敗した論文ID（登録を取り消す）
+    claimed_ids = set()
+    failed_ids = set()
     
-    # 処理対象の論文がない場合
-    if not papers_to_process:
-        logging.info("処理対象の論文がありません。")
-        sys.exit(0)
+    # 他の検索セットでダウンロード済みのPDFの索引（ループの外で一度だけ作成）
+    pdf_index = build_pdf_index()
     
-    # 論文を処理（最後の論文以外はTwitter投稿をスキップ）
-    for i, paper in enumerate(papers_to_process):
-        # 最後の論文以外はTwitter投稿をスキップ
-        is_last_paper = (i == len(papers_to_process) - 1)
-        current_skip_twitter = args.skip_twitter or not is_last_paper
-        
-        if current_skip_twitter:
-            logging.info(f"論文 {i+1}/{len(papers_to_process)}: {paper.title} - Twitter投稿はスキップします")
-        else:
-            logging.info(f"論文 {i+1}/{len(papers_to_process)}: {paper.title} - Twitter投稿を行います")
-        
-        # 論文を処理
-        if args.verbose:
-            logging.debug(f"論文を処理中: {paper.title}")
+    try:
+        # 処理対象の論文を選定
+        for i, paper in enumerate(papers):
+            if processed_count >= max_process_count:
+                break
+            
+            # arXiv IDを抽出
+            arxiv_id = extract_arxiv_id(paper)
             
-        success = process_paper(paper, dirs, openai_client, config, args.force_process, current_skip_twitter)
+            # 処理済みかどうかを確認
+            if not is_processed(arxiv_id, dirs['processed'], processed_ids) or args.force_process:
+                # ダウンロード前にデータベースへ処理中として登録する（他の検索セットが先に登録した場合はスキップ）
+                if processed_db is not None:
+                    if claim_processed_id(processed_db, arxiv_id):
+                        claimed_ids.add(arxiv_id)
+                    elif not args.force_process:
+                        logging.info("他の検索セットで処理済みのためスキップします: %s", arxiv_id)
+                        continue
+                
+                # PDFが他のディレクトリに存在するかチェックし、存在する場合はコピー
+                if not copy_pdf_if_exists(arxiv_id, dirs['dl'], pdf_index):
+                    # コピーできなかった場合はダウンロード
+                    success, _, _ = download_pdf(paper, dirs['dl'])
+                    if not success:
+                        failed_ids.add(arxiv_id)
+                        continue
+                
+                papers_to_process.append(paper)
+                newly_processed_ids.add(arxiv_id)
+                processed_count += 1
         
-        # Twitter投稿の結果をログに記録
-        if success and not current_skip_twitter:
-            twitter_msg = f"Twitter投稿完了: {paper.title}"
-            logging.info(twitter_msg)
-            print(twitter_msg)
+        # 処理対象の論文がない場合
+        if not papers_to_process:
+            logging.info("処理対象の論文がありません。")
+            return set()
         
-        # arXivのAPIレート制限を回避するために待機
-        # 以前は1秒だったが、より長い待機時間に変更
-        wait_time = 5  # 5秒待機
-        if args.verbose:
-            logging.debug(f"{wait_time}秒待機中...")
-        time.sleep(wait_time)
+        success = process_selected_papers(papers_to_process, dirs, config, args, log_file, failed_ids, processed_db)
+    except BaseException:
+        # 途中で中断した場合は、この実行で登録した論文IDを全て取り消す
+        failed_ids |= claimed_ids
+        raise
+    finally:
+        released_ids = failed_ids & claimed_ids
+        if released_ids:
+            release_processed_ids(processed_db, released_ids)
+            logging.info("処理に失敗した%s件の論文IDの登録を取り消しました。", len(released_ids))
+    
+    newly_processed_ids -= failed_ids
+    last_paper = papers_to_process[-1]
+    
+    # Twitter投稿の結果をログに記録
+    if success and not args.skip_twitter:
+        twitter_msg = f"Twitter投稿完了: {last_paper.title}"
+        logging.info(twitter_msg)
+        print(twitter_msg)
     
     # Twitter投稿の有無を確認
     twitter_posted = False
@@ -604,11 +1142,13 @@ def main():
     # 処理した論文IDを出力
     if args.output_processed_ids and newly_processed_ids:
         with open(args.output_processed_ids, 'w') as f:
-            f.write('\n'.join(newly_processed_ids))
-        logging.info(f"{len(newly_processed_ids)}件の処理済み論文IDを出力しました: {args.output_processed_ids}")
+            f.writelines(f"{paper_id}\n" for paper_id in newly_processed_ids)
+        logging.info("%s件の処理済み論文IDを出力しました: %s", len(newly_processed_ids), args.output_processed_ids)
+    
+    logging.info("\n処理完了: %s/%s件の論文を処理しました。", processed_count, len(papers))
+    logging.info("Twitter投稿: %s", 'あり' if twitter_posted else 'なし')
     
-    logging.info(f"\n処理完了: {processed_count}/{len(papers)}件の論文を処理しました。")
-    logging.info(f"Twitter投稿: {'あり' if twitter_posted else 'なし'}")
+    return newly_processed_ids
 
 if __name__ == "__main__":
     main()
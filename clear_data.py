@@ -6,6 +6,10 @@ import shutil
 import glob
 import logging
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# ファイル削除に使うスレッド数
+CLEAR_WORKERS = 8
 
 def setup_logging():
     """
@@ -16,6 +20,24 @@ def setup_logging():
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
 
+def remove_item(item):
+    """
+    ファイルまたはディレクトリを削除
+    
+    Args:
+        item (tuple): (削除対象のパス, ディレクトリかどうか)
+    """
+    item_path, is_dir = item
+    try:
+        if is_dir:
+            shutil.rmtree(item_path)
+            logging.info(f"ディレクトリを削除しました: {item_path}")
+        else:
+            os.unlink(item_path)
+            logging.info(f"ファイルを削除しました: {item_path}")
+    except Exception as e:
+        logging.error(f"削除中にエラーが発生しました: {item_path} - {str(e)}")
+
 def clear_directory(directory, keep_dir=True):
     """
     ディレクトリ内のファイルを削除
@@ -29,18 +51,12 @@ def clear_directory(directory, keep_dir=True):
         return
     
     if keep_dir:
-        # ディレクトリ内のファイルのみを削除
-        for item in os.listdir(directory):
-            item_path = os.path.join(directory, item)
-            try:
-                if os.path.isfile(item_path):
-                    os.unlink(item_path)
-                    logging.info(f"ファイルを削除しました: {item_path}")
-                elif os.path.isdir(item_path):
-                    shutil.rmtree(item_path)
-                    logging.info(f"ディレクトリを削除しました: {item_path}")
-            except Exception as e:
-                logging.error(f"削除中にエラーが発生しました: {item_path} - {str(e)}")
+        # ディレクトリ内のファイルのみを削除（削除はI/O待ちが中心のためスレッドで並列に行う）
+        with os.scandir(directory) as entries:
+            items = [(entry.path, entry.is_dir(follow_symlinks=False)) for entry in entries]
+        
+        with ThreadPoolExecutor(max_workers=CLEAR_WORKERS) as executor:
+            list(executor.map(remove_item, items))
     else:
         # ディレクトリごと削除して再作成
         try:
@@ -61,7 +77,7 @@ def main():
     parser.add_argument(
         '--all',
         action='store_true',
-        help='すべてのデータをクリア（PDFs, テキスト, 要約, 処理済み記録, ログ）'
+        help='すべてのデータをクリア（PDFs, テキスト, 要約, 処理済み記録, ログ, キャッシュ）'
     )
     parser.add_argument(
         '--pdfs',
@@ -88,6 +104,11 @@ def main():
         action='store_true',
         help='ログファイルをクリア'
     )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='arXiv検索結果のキャッシュをクリア'
+    )
     
     args = parser.parse_args()
     
@@ -100,10 +121,12 @@ def main():
     # ディレクトリパスを設定
     dirs = {
         'dl': os.path.join(base_dir, 'dl'),
+        'pdf': os.path.join(base_dir, 'pdf'),
         'text': os.path.join(base_dir, 'text'),
         'summary': os.path.join(base_dir, 'summary'),
         'processed': os.path.join(base_dir, 'processed'),
-        'logs': os.path.join(base_dir, 'logs')
+        'logs': os.path.join(base_dir, 'logs'),
+        'cache': os.path.join(base_dir, 'cache')
     }
     
     # 引数に基づいてクリア対象を決定
@@ -112,6 +135,8 @@ def main():
     if clear_all or args.pdfs:
         logging.info("PDFファイルをクリアしています...")
         clear_directory(dirs['dl'])
+        # 検索セットごとのPDFディレクトリ（run_multiple_searches.pyが使用）
+        clear_directory(dirs['pdf'])
     
     if clear_all or args.texts:
         logging.info("テキストファイルをクリアしています...")
@@ -129,8 +154,12 @@ def main():
         logging.info("ログファイルをクリアしています...")
         clear_directory(dirs['logs'])
     
+    if clear_all or args.cache:
+        logging.info("検索結果のキャッシュをクリアしています...")
+        clear_directory(dirs['cache'])
+    
     # 引数が指定されていない場合は、ヘルプを表示
-    if not (clear_all or args.pdfs or args.texts or args.summaries or args.processed or args.logs):
+    if not (clear_all or args.pdfs or args.texts or args.summaries or args.processed or args.logs or args.cache):
         parser.print_help()
     else:
         logging.info("クリア処理が完了しました。")
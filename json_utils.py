@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import mmap
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# このサイズ以上のファイルはメモリマップして読み込む（小さいファイルではread()の方が速い）
+MMAP_THRESHOLD = 16 * 1024
+
+def dump_json(data, path):
+    """
+    データをJSONファイルに保存する（UTF-8、インデント2）
+    
+    orjsonが利用可能な場合はそちらを使い、利用できない場合は標準のjsonモジュールを使う
+    
+    Args:
+        data: 保存するデータ
+        path (str): 保存先ファイルのパス
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+def dumps_json(data):
+    """
+    データをJSON文字列に変換する（インデントなし）
+    
+    Args:
+        data: 変換するデータ
+    
+    Returns:
+        str: JSON文字列
+    """
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False)
+
+def loads_json(text):
+    """
+    JSON文字列を読み込む
+    
+    Args:
+        text (str or bytes): JSON文字列
+    
+    Returns:
+        読み込んだデータ
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def load_json(path):
+    """
+    JSONファイルを読み込む
+    
+    Args:
+        path (str): JSONファイルのパス
+    
+    Returns:
+        読み込んだデータ
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    return orjson.loads(view)
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -2,19 +2,130 @@
 # -*- coding: utf-8 -*-
 
 import os
+import time
 import PyPDF2
 import logging
 
-def extract_text_from_pdf(pdf_path, output_dir):
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+try:
+    import pymupdf
+except ImportError:
+    try:
+        import fitz as pymupdf
+    except ImportError:
+        pymupdf = None
+
+# 優先して使うPDFテキスト抽出バックエンド（pypdfium2 / pymupdf / pypdf2）
+PDF_BACKEND = os.environ.get("PDF_BACKEND", "pypdfium2").lower()
+
+def _log_page_progress(page_index, num_pages):
+    """
+    ページ単位の進捗をログに出力する（10ページごと、および最終ページ）
+    """
+    if (page_index + 1) % 10 == 0 or page_index + 1 == num_pages:
+        logging.info("  %s/%sページ処理完了", page_index + 1, num_pages)
+
+def _extract_text_pypdfium2(pdf_path):
+    """
+    pypdfium2（PDFium）でPDFからテキストを抽出する
+    
+    PDFiumはスレッドセーフではないため、ページは1ページずつ順番に処理する。
+    並列化は論文単位のワーカープロセス（arxiv_downloader）で行う
+    
+    Args:
+        pdf_path (str): PDFファイルのパス
+    
+    Returns:
+        str: 抽出したテキスト
+    """
+    pdf = pypdfium2.PdfDocument(pdf_path)
+    try:
+        num_pages = len(pdf)
+        logging.info("PDFファイルを読み込みました（ページ数: %sページ）", num_pages)
+        
+        text_parts = []
+        for i in range(num_pages):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            text_parts.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+            _log_page_progress(i, num_pages)
+        
+        return "\n\n".join(text_parts)
+    finally:
+        pdf.close()
+
+def _extract_text_pymupdf(pdf_path):
+    """
+    PyMuPDF（MuPDF）でPDFからテキストを抽出する（行末のハイフネーションは結合する）
+    
+    Args:
+        pdf_path (str): PDFファイルのパス
+    
+    Returns:
+        str: 抽出したテキスト
+    """
+    flags = pymupdf.TEXTFLAGS_TEXT | pymupdf.TEXT_DEHYPHENATE
+    with pymupdf.open(pdf_path) as doc:
+        num_pages = len(doc)
+        logging.info("PDFファイルを読み込みました（ページ数: %sページ）", num_pages)
+        
+        text_parts = []
+        for i, page in enumerate(doc):
+            text_parts.append(page.get_text("text", flags=flags))
+            _log_page_progress(i, num_pages)
+        
+        return "\n\n".join(text_parts)
+
+def _extract_text_pypdf2(pdf_path):
+    """
+    PyPDF2でPDFからテキストを抽出する（他のバックエンドが使えない場合のフォールバック）
+    
+    Args:
+        pdf_path (str): PDFファイルのパス
+    
+    Returns:
+        str: 抽出したテキスト
+    """
+    with open(pdf_path, 'rb') as file:
+        # PDFReaderオブジェクトを作成
+        reader = PyPDF2.PdfReader(file)
+        num_pages = len(reader.pages)
+        logging.info("PDFファイルを読み込みました（ページ数: %sページ）", num_pages)
+        
+        text_parts = []
+        for i, page in enumerate(reader.pages):
+            text_parts.append(page.extract_text())
+            _log_page_progress(i, num_pages)
+        
+        return "\n\n".join(text_parts)
+
+# バックエンド名 -> (モジュール, 抽出関数)
+_PDF_BACKENDS = {
+    "pypdfium2": (pypdfium2, _extract_text_pypdfium2),
+    "pymupdf": (pymupdf, _extract_text_pymupdf),
+    "pypdf2": (PyPDF2, _extract_text_pypdf2),
+}
+
+def extract_text_from_pdf(pdf_path, output_dir, write_to_disk=True):
     """
     PDFからテキストを抽出し、テキストファイルに保存する
     
+    環境変数PDF_BACKENDで指定したバックエンド（デフォルト: pypdfium2）を使い、
+    利用できない場合や失敗した場合はPyPDF2で再試行する
+    
     Args:
         pdf_path (str): PDFファイルのパス
         output_dir (str): 出力先ディレクトリ
+        write_to_disk (bool): 抽出したテキストをファイルに保存するかどうか（確認用）
     
     Returns:
-        str: 抽出したテキストを保存したファイルのパス
+        tuple: (抽出したテキスト, 保存したファイルのパス)（失敗した場合は(None, None)、保存しない場合はパスがNone）
     """
     # ファイル名を取得（拡張子なし）
     filename = os.path.basename(pdf_path)
@@ -25,38 +136,42 @@ def extract_text_from_pdf(pdf_path, output_dir):
     
     try:
         # PDFファイルを開く
-        logging.info(f"PDFファイルを開いています: {pdf_path}")
-        import time
+        logging.info("PDFファイルを開いています: %s", pdf_path)
         start_time = time.time()
         
-        with open(pdf_path, 'rb') as file:
-            # PDFReaderオブジェクトを作成
-            reader = PyPDF2.PdfReader(file)
-            num_pages = len(reader.pages)
-            logging.info(f"PDFファイルを読み込みました（ページ数: {num_pages}ページ）")
-            
-            # テキストを抽出
-            logging.info(f"PDFからテキストを抽出中...")
-            text = ""
-            for i, page in enumerate(reader.pages):
-                page_text = page.extract_text()
-                text += page_text + "\n\n"
-                if (i + 1) % 10 == 0 or i + 1 == num_pages:
-                    logging.info(f"  {i + 1}/{num_pages}ページ処理完了")
-            
-            text_length = len(text)
-            logging.info(f"テキスト抽出完了（文字数: {text_length}文字）")
-            
-            # テキストファイルに保存
-            logging.info(f"抽出したテキストをファイルに保存中: {output_path}")
+        # テキストを抽出
+        logging.info("PDFからテキストを抽出中...")
+        text = None
+        module, extract = _PDF_BACKENDS.get(PDF_BACKEND, (None, None))
+        if extract is None:
+            logging.warning("不明なPDFバックエンドです。PyPDF2を使用します: %s", PDF_BACKEND)
+        elif module is None:
+            logging.warning("%sがインストールされていません。PyPDF2を使用します", PDF_BACKEND)
+        elif extract is not _extract_text_pypdf2:
+            try:
+                text = extract(pdf_path)
+            except Exception as e:
+                logging.warning("%sでのテキスト抽出に失敗しました。PyPDF2で再試行します: %s - %s", PDF_BACKEND, pdf_path, e)
+        
+        if text is None:
+            text = _extract_text_pypdf2(pdf_path)
+        
+        text_length = len(text)
+        logging.info("テキスト抽出完了（文字数: %s文字）", text_length)
+        
+        # テキストファイルに保存
+        if write_to_disk:
+            logging.info("抽出したテキストをファイルに保存中: %s", output_path)
             with open(output_path, 'w', encoding='utf-8') as text_file:
                 text_file.write(text)
-            
-            end_time = time.time()
-            processing_time = end_time - start_time
-            logging.info(f"テキスト抽出・保存完了: {pdf_path} -> {output_path}（所要時間: {processing_time:.2f}秒）")
-            return output_path
+        else:
+            output_path = None
+        
+        end_time = time.time()
+        processing_time = end_time - start_time
+        logging.info("テキスト抽出・保存完了: %s -> %s（所要時間: %.2f秒）", pdf_path, output_path, processing_time)
+        return text, output_path
     
     except Exception as e:
-        logging.error(f"テキスト抽出エラー: {pdf_path} - {str(e)}")
-        return None
\ No newline at end of file
+        logging.error("テキスト抽出エラー: %s - %s", pdf_path, e)
+        return None, None
\ No newline at end of file
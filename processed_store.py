@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import sqlite3
+import logging
+
+# 1回のIN検索で渡す論文IDの最大数（SQLiteのパラメータ数上限より小さくする）
+QUERY_CHUNK_SIZE = 500
+
+# 処理中として登録した論文IDを、登録したプロセスが生きていても取り消すまでの時間（秒）
+# Batch APIの完了待ち（最大24時間）より長くする
+CLAIM_TIMEOUT = 25 * 60 * 60
+
+def open_processed_db(db_path, legacy_path=None):
+    """
+    処理済み論文IDのデータベース（SQLite）を開く
+    
+    テーブルが空で、旧形式の処理済み論文IDファイルが存在する場合はその内容を取り込む。
+    claimed_by/claimed_atがNULLの行は処理済み、それ以外はclaim_processed_idで登録した処理中の行
+    
+    Args:
+        db_path (str): データベースファイルのパス
+        legacy_path (str, optional): 旧形式の処理済み論文IDファイル（1行に1件）のパス
+    
+    Returns:
+        sqlite3.Connection: データベース接続
+    """
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS processed (id TEXT PRIMARY KEY, claimed_by INTEGER, claimed_at REAL) WITHOUT ROWID")
+    
+    # 処理中の状態を持たない旧形式のテーブルに列を追加
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(processed)")}
+        if 'claimed_at' not in columns:
+            conn.execute("ALTER TABLE processed ADD COLUMN claimed_by INTEGER")
+            conn.execute("ALTER TABLE processed ADD COLUMN claimed_at REAL")
+    
+    # 旧形式のファイルから移行
+    if legacy_path and os.path.exists(legacy_path) and count_processed_ids(conn) == 0:
+        with open(legacy_path, 'r') as f:
+            paper_ids = [line.rstrip('\n') for line in f if line.strip()]
+        add_processed_ids(conn, paper_ids)
+        logging.info("%s件の処理済み論文IDを%sから移行しました。", len(paper_ids), legacy_path)
+    
+    return conn
+
+def contains_processed_id(conn, paper_id):
+    """
+    論文IDが処理済み（または処理中）かどうかを確認
+    
+    Args:
+        conn (sqlite3.Connection): データベース接続
+        paper_id (str): 論文のarXiv ID
+    
+    Returns:
+        bool: 処理済みかどうか
+    """
+    return conn.execute("SELECT 1 FROM processed WHERE id = ?", (paper_id,)).fetchone() is not None
+
+def filter_processed_ids(conn, paper_ids):
+    """
+    論文IDの一覧のうち処理済み（または処理中）のものをまとめて取得する（IDごとに問い合わせない）
+    
+    Args:
+        conn (sqlite3.Connection): データベース接続
+        paper_ids (list): 確認する論文IDの一覧
+    
+    Returns:
+        set: 処理済み（または処理中）の論文IDのセット
+    """
+    found = set()
+    for start in range(0, len(paper_ids), QUERY_CHUNK_SIZE):
+        chunk = paper_ids[start:start + QUERY_CHUNK_SIZE]
+        placeholders = ','.join('?' * len(chunk))
+        rows = conn.execute(f"SELECT id FROM processed WHERE id IN ({placeholders})", chunk)
+        found.update(row[0] for row in rows)
+    return found
+
+def add_processed_ids(conn, paper_ids):
+    """
+    処理済み論文IDを追加する（1つのトランザクションでまとめて追加）
+    
+    claim_processed_idで処理中として登録した論文IDは処理済みに確定する
+    
+    Args:
+        conn (sqlite3.Connection): データベース接続
+        paper_ids (iterable): 追加する論文IDの一覧
+    """
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO processed (id) VALUES (?)", ((paper_id,) for paper_id in paper_ids))
+
+def claim_processed_id(conn, paper_id):
+    """
+    論文IDを処理中として登録する（同時に実行中の他の検索セットと同じ論文を処理しないようにする）
+    
+    処理が完了したらadd_processed_idsで処理済みに確定する。確定しないままプロセスが終了した場合は
+    次回の起動時にrelease_stale_claimsで取り消される
+    
+    Args:
+        conn (sqlite3.Connection): データベース接続
+        paper_id (str): 論文のarXiv ID
+    
+    Returns:
+        bool: 登録できたかどうか（既に登録済みの場合はFalse）
+    """
+    with conn:
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO processed (id, claimed_by, claimed_at) VALUES (?, ?, ?)",
+            (paper_id, os.getpid(), time.time())
+        )
+    return cursor.rowcount == 1
+
+def release_processed_ids(conn, paper_ids):
+    """
+    claim_processed_idで登録した論文IDを取り消す（処理に失敗した論文を次回の実行で再処理できるようにする）
+    
+    処理済みに確定した論文IDは取り消さない
+    
+    Args:
+        conn (sqlite3.Connection): データベース接続
+        paper_ids (iterable): 取り消す論文IDの一覧
+    """
+    with conn:
+        conn.executemany(
+            "DELETE FROM processed WHERE id = ? AND claimed_at IS NOT NULL",
+            ((paper_id,) for paper_id in paper_ids)
+        )
+
+def is_process_alive(pid):
+    """
+    指定したプロセスIDのプロセスが存在するかどうかを確認
+    
+    Args:
+        pid (int): プロセスID
+    
+    Returns:
+        bool: プロセスが存在するかどうか
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def release_stale_claims(conn, timeout=CLAIM_TIMEOUT):
+    """
+    処理中のまま残った論文IDの登録を取り消す（起動時に呼び出す）
+    
+    登録したプロセスが既に終了している場合（SIGKILLやOOMで強制終了した場合など）と、
+    登録からtimeout秒以上経過した場合に取り消し、次回の実行で再処理できるようにする
+    
+    Args:
+        conn (sqlite3.Connection): データベース接続
+        timeout (float): 処理中の登録を取り消すまでの時間（秒）
+    
+    Returns:
+        int: 取り消した論文IDの件数
+    """
+    deadline = time.time() - timeout
+    rows = conn.execute("SELECT id, claimed_by, claimed_at FROM processed WHERE claimed_at IS NOT NULL").fetchall()
+    stale_ids = [
+        paper_id for paper_id, claimed_by, claimed_at in rows
+        if claimed_at < deadline or claimed_by is None or not is_process_alive(claimed_by)
+    ]
+    release_processed_ids(conn, stale_ids)
+    return len(stale_ids)
+
+def count_processed_ids(conn):
+    """
+    処理済み論文IDの件数を取得（処理中の論文IDは含まない）
+    
+    Args:
+        conn (sqlite3.Connection): データベース接続
+    
+    Returns:
+        int: 処理済み論文IDの件数
+    """
+    return conn.execute("SELECT COUNT(*) FROM processed WHERE claimed_at IS NULL").fetchone()[0]
\ No newline at end of file
@@ -2,19 +2,42 @@
 # -*- coding: utf-8 -*-
 
 import os
+import re
 import yaml
 import time
-import subprocess
 import logging
-import shutil
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from processed_store import open_processed_db, add_processed_ids, count_processed_ids, release_stale_claims
+import arxiv_downloader
+import web_generator
+
+# libyamlがあればCで実装されたローダーを使う（なければPure Python版）
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# 並列実行中の検索セット間で共有する状態（タイムスタンプ、処理済み論文ID）を保護するロック
+_state_lock = threading.Lock()
+
+# 検索セットの開始間隔を保つためのロックと前回の開始時刻（wait_for_set_startで更新）
+_start_lock = threading.Lock()
+_last_set_start = None
+
+# このスクリプトのディレクトリ（設定ファイル、タイムスタンプファイルやデータベースの保存先）
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ログディレクトリ名に使えない文字（英数字以外）
+_SAFE_KW_RE = re.compile(r'[^a-zA-Z0-9]')
 
 def load_config():
     """設定ファイルを読み込む"""
     try:
-        with open('config.yaml', 'r') as f:
-            config = yaml.safe_load(f)
+        with open(os.path.join(_SCRIPT_DIR, 'config.yaml'), 'r') as f:
+            config = yaml.load(f, Loader=YamlLoader)
         return config
     except Exception as e:
         logging.error(f"設定ファイルの読み込みエラー: {str(e)}")
@@ -28,26 +51,27 @@ def generate_pdf_dir_name(keywords):
     return f"./pdf/search_{int(time.time())}"
 
 def setup_pdf_directory(keywords):
-    """PDFディレクトリを設定する"""
+    """PDFディレクトリを設定する（検索セットごとに別のディレクトリを使う）"""
     pdf_dir = generate_pdf_dir_name(keywords)
     os.makedirs(pdf_dir, exist_ok=True)
-    
-    # シンボリックリンクを作成（既存のdlディレクトリをPDFディレクトリにリンク）
-    dl_dir = "./dl"
-    if os.path.exists(dl_dir):
-        if os.path.islink(dl_dir):
-            os.unlink(dl_dir)
-        else:
-            shutil.rmtree(dl_dir)
-    
-    os.symlink(pdf_dir, dl_dir)
     logging.info(f"PDFディレクトリを設定: {pdf_dir}")
     
     return pdf_dir
 
+def wait_for_set_start(wait_time):
+    """前回の検索セットの開始からwait_time秒経過するまで待機する（arXivへの同時アクセスを分散する）"""
+    global _last_set_start
+    with _start_lock:
+        if _last_set_start is not None:
+            remaining = _last_set_start + wait_time - time.monotonic()
+            if remaining > 0:
+                logging.info(f"{remaining:.1f}秒待機中...")
+                time.sleep(remaining)
+        _last_set_start = time.monotonic()
+
 def get_timestamp_file_path():
     """タイムスタンプファイルのパスを取得する"""
-    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "last_run_timestamp.json")
+    return os.path.join(_SCRIPT_DIR, "last_run_timestamp.json")
 
 def load_timestamps():
     """前回の実行タイムスタンプを読み込む"""
@@ -70,42 +94,43 @@ def save_timestamps(timestamps):
         logging.error(f"タイムスタンプファイルの保存エラー: {str(e)}")
 
 def get_processed_ids_file_path():
-    """処理済み論文IDファイルのパスを取得する"""
-    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "processed_paper_ids.txt")
+    """旧形式の処理済み論文IDファイルのパスを取得する（データベースへの移行元）"""
+    return os.path.join(_SCRIPT_DIR, "processed_paper_ids.txt")
+
+def get_processed_db_path():
+    """処理済み論文IDデータベースのパスを取得する"""
+    return os.path.join(_SCRIPT_DIR, "processed.db")
 
 def load_processed_ids():
-    """処理済み論文IDを読み込む"""
-    processed_ids_file = get_processed_ids_file_path()
-    processed_ids = set()
-    if os.path.exists(processed_ids_file):
-        try:
-            with open(processed_ids_file, 'r') as f:
-                processed_ids = set(f.read().splitlines())
-            logging.info(f"{len(processed_ids)}件の処理済み論文IDを読み込みました。")
-        except Exception as e:
-            logging.error(f"処理済み論文IDファイルの読み込みエラー: {str(e)}")
-    return processed_ids
+    """処理済み論文IDのデータベースを開く（初回は旧形式のファイルから移行し、中断された処理中の登録を取り消す）"""
+    try:
+        conn = open_processed_db(get_processed_db_path(), get_processed_ids_file_path())
+        released_count = release_stale_claims(conn)
+        if released_count:
+            logging.info(f"処理が中断された{released_count}件の論文IDの登録を取り消しました。")
+        logging.info(f"{count_processed_ids(conn)}件の処理済み論文IDがあります。")
+        return conn
+    except Exception as e:
+        logging.error(f"処理済み論文IDデータベースの読み込みエラー: {str(e)}")
+        return None
 
-def save_processed_ids(processed_ids):
-    """処理済み論文IDを保存する"""
-    processed_ids_file = get_processed_ids_file_path()
+def save_processed_ids(conn, new_processed_ids):
+    """新しく処理した論文IDをデータベースに追加する"""
     try:
-        with open(processed_ids_file, 'w') as f:
-            f.write('\n'.join(processed_ids))
-        logging.info(f"{len(processed_ids)}件の処理済み論文IDを保存しました。")
+        add_processed_ids(conn, new_processed_ids)
+        logging.info(f"{len(new_processed_ids)}件の処理済み論文IDを保存しました。")
     except Exception as e:
-        logging.error(f"処理済み論文IDファイルの保存エラー: {str(e)}")
+        logging.error(f"処理済み論文IDデータベースの保存エラー: {str(e)}")
 
-def run_search_set(keywords, output_dir, max_results=100, tweet_enabled=True, timestamps=None, processed_ids=None, search_set_id=None):
+def run_search_set(keywords, output_dir, max_results=100, tweet_enabled=True, timestamps=None, processed_db_path=None, search_set_id=None):
     """検索セットを実行する"""
     # PDFディレクトリを設定
     pdf_dir = setup_pdf_directory(keywords)
     
     # 検索セット専用のログディレクトリを作成
     # キーワードからログディレクトリ名を生成（特殊文字を除去）
-    import re
     # 特殊文字を除去し、英数字とアンダースコアのみにする
-    safe_keywords = [re.sub(r'[^a-zA-Z0-9]', '_', kw) for kw in keywords]
+    safe_keywords = [_SAFE_KW_RE.sub('_', kw) for kw in keywords]
     keywords_str = '_'.join(safe_keywords)
     log_dir = f"./logs/{keywords_str}"
     os.makedirs(log_dir, exist_ok=True)
@@ -123,26 +148,19 @@ def run_search_set(keywords, output_dir, max_results=100, tweet_enabled=True, ti
     # 現在のタイムスタンプを記録
     current_timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
     
-    # 処理済み論文IDを一時ファイルに保存
-    processed_ids_file = None
-    if processed_ids:
-        processed_ids_file = f"./temp_processed_ids_{search_set_id}.txt"
-        with open(processed_ids_file, 'w') as f:
-            f.write('\n'.join(processed_ids))
-    
-    # 新しく処理した論文IDを保存するファイル
-    new_processed_ids_file = f"./new_processed_ids_{search_set_id}.txt"
-    
-    # arxiv_downloader.pyを実行
+    # arxiv_downloaderの引数
     cmd = [
-        'python3', 'arxiv_downloader.py',
         *keywords,  # キーワードを展開
         '--max-results', str(max_results),
         '--max-process', '9999',  # 実質無制限
-        '--log-dir', log_dir  # ログディレクトリを指定
+        '--log-dir', log_dir,  # ログディレクトリを指定
+        '--pdf-dir', pdf_dir,  # 検索セット専用のPDFディレクトリを指定
+        # 論文を並列処理するワーカープロセス数（検索セットごと。全体では最大でparallel_sets倍になる）
+        '--workers', str(config.get('execution', {}).get('workers_per_set', arxiv_downloader.DEFAULT_WORKERS))
     ]
     
     # 詳細モードの場合は--verboseオプションを追加
+    # （DEBUGのログが検索セットのログファイルに出力されるのは、このスクリプトも--verboseで実行した場合のみ）
     if config.get('verbose', False):
         cmd.append('--verbose')
     
@@ -156,47 +174,39 @@ def run_search_set(keywords, output_dir, max_results=100, tweet_enabled=True, ti
         cmd.extend(['--last-paper-id', last_paper_id])
         logging.info(f"論文IDフィルタを適用: {last_paper_id} 以降")
     
-    # 処理済み論文IDを渡す
-    if processed_ids_file:
-        cmd.extend(['--processed-ids-file', processed_ids_file])
-    
-    # 処理した論文IDを出力するファイルを指定
-    cmd.extend(['--output-processed-ids', new_processed_ids_file])
-    
     # Twitter投稿が無効の場合、オプションを追加
     if not tweet_enabled:
         cmd.append('--skip-twitter')
     
+    # arxiv_downloaderを同じプロセス内で実行（新しく処理した論文IDが返る）
     logging.info(f"検索実行: {keywords_str}")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    
-    # 一時ファイルを削除
-    if processed_ids_file and os.path.exists(processed_ids_file):
-        os.remove(processed_ids_file)
-    
-    if result.returncode != 0:
-        logging.error(f"arxiv_downloaderの実行エラー: {result.stderr}")
+    processed_db = None
+    try:
+        # 処理済み論文IDのデータベースはこのスレッドで開いた接続をそのまま渡す
+        if processed_db_path:
+            processed_db = open_processed_db(processed_db_path)
+        new_processed_ids = arxiv_downloader.main(cmd, processed_db=processed_db)
+    except SystemExit as e:
+        # 引数エラーなどでargparseが終了した場合
+        logging.error(f"arxiv_downloaderの実行エラー: 終了コード {e.code}")
         return False, set()
-    
-    logging.info(result.stdout)
-    
-    # 新しく処理した論文IDを読み込む
-    new_processed_ids = set()
-    if os.path.exists(new_processed_ids_file):
-        with open(new_processed_ids_file, 'r') as f:
-            new_processed_ids = set(f.read().splitlines())
-        os.remove(new_processed_ids_file)
+    except Exception as e:
+        logging.error(f"arxiv_downloaderの実行エラー: {str(e)}")
+        return False, set()
+    finally:
+        if processed_db is not None:
+            processed_db.close()
     
     # タイムスタンプを更新
     if timestamps is not None and search_set_id is not None:
-        timestamps[search_set_id] = {
-            'timestamp': current_timestamp,
-            'last_paper_id': None  # 最後の論文IDは現在未実装
-        }
+        with _state_lock:
+            timestamps[search_set_id] = {
+                'timestamp': current_timestamp,
+                'last_paper_id': None  # 最後の論文IDは現在未実装
+            }
     
-    # web_generator.pyを実行
+    # web_generatorの引数
     web_cmd = [
-        'python3', 'web_generator.py',
         '--log-dir', log_dir,  # ログディレクトリを指定
         '--output-dir', output_dir
     ]
@@ -208,13 +218,20 @@ def run_search_set(keywords, output_dir, max_results=100, tweet_enabled=True, ti
     else:
         logging.info(f"Webページ生成（全ての日付）: {output_dir}")
     
-    web_result = subprocess.run(web_cmd, capture_output=True, text=True)
+    # web_generatorを同じプロセス内で実行
+    try:
+        web_success = web_generator.main(web_cmd)
+    except SystemExit as e:
+        logging.error(f"web_generatorの実行エラー: 終了コード {e.code}")
+        return False, new_processed_ids
+    except Exception as e:
+        logging.error(f"web_generatorの実行エラー: {str(e)}")
+        return False, new_processed_ids
     
-    if web_result.returncode != 0:
-        logging.error(f"web_generatorの実行エラー: {web_result.stderr}")
+    if not web_success:
+        logging.error(f"web_generatorの実行エラー: Webページの生成に失敗しました: {output_dir}")
         return False, new_processed_ids
     
-    logging.info(web_result.stdout)
     logging.info(f"検索セット完了: {keywords_str}")
     return True, new_processed_ids
 
@@ -273,8 +290,10 @@ def main():
     # 前回の実行タイムスタンプを読み込む
     timestamps = load_timestamps()
     
-    # 処理済み論文IDを読み込む
-    processed_ids = load_processed_ids()
+    # 処理済み論文IDのデータベースを開く
+    processed_db = load_processed_ids()
+    if processed_db is None:
+        return
     
     # 検索セットを取得
     search_sets = config.get('search_sets', [])
@@ -282,56 +301,64 @@ def main():
         logging.error("検索セットが定義されていません。")
         return
     
-    # 待機時間を取得
+    # 待機時間（検索セットの開始間隔）と同時に実行する検索セット数を取得
     wait_time = config.get('execution', {}).get('wait_between_sets', 10)
+    parallel_sets = config.get('execution', {}).get('parallel_sets', 4)
     
     # 新しく処理した論文IDを追跡
     all_new_processed_ids = set()
     
-    # 各検索セットを実行
-    for i, search_set in enumerate(search_sets):
-        keywords = search_set.get('keywords', [])
-        output_dir = search_set.get('output_dir', '')
-        max_results = search_set.get('max_results', 100)  # デフォルト: 100
-        tweet_enabled = search_set.get('tweet_enabled', True)  # デフォルト: True
-        
-        if not keywords or not output_dir:
-            logging.warning(f"検索セット {i+1} はキーワードまたは出力先ディレクトリが定義されていません。スキップします。")
-            continue
-        
-        # 検索セットのIDを生成
-        search_set_id = '_'.join(keywords)
-        
+    def run_one(i, keywords, output_dir, max_results, tweet_enabled, search_set_id):
+        """検索セットを1つ実行する（ワーカースレッドで実行）"""
+        wait_for_set_start(wait_time)
         logging.info(f"検索セット {i+1}/{len(search_sets)} を開始: {' '.join(keywords)}")
         logging.info(f"  最大検索結果数: {max_results}, Twitter投稿: {'有効' if tweet_enabled else '無効'}")
-        
-        try:
-            success, new_processed_ids = run_search_set(
-                keywords, 
-                output_dir, 
-                max_results, 
-                tweet_enabled,
-                timestamps,
-                processed_ids,
-                search_set_id
-            )
+        return run_search_set(
+            keywords, 
+            output_dir, 
+            max_results, 
+            tweet_enabled,
+            timestamps,
+            get_processed_db_path(),
+            search_set_id
+        )
+    
+    # 各検索セットを並列に実行（同じ論文は、先にデータベースへ登録した検索セットだけが処理する）
+    with ThreadPoolExecutor(max_workers=max(1, parallel_sets)) as executor:
+        futures = {}
+        for i, search_set in enumerate(search_sets):
+            keywords = search_set.get('keywords', [])
+            output_dir = search_set.get('output_dir', '')
+            max_results = search_set.get('max_results', 100)  # デフォルト: 100
+            tweet_enabled = search_set.get('tweet_enabled', True)  # デフォルト: True
             
-            # 処理済み論文IDを更新
-            all_new_processed_ids.update(new_processed_ids)
+            if not keywords or not output_dir:
+                logging.warning(f"検索セット {i+1} はキーワードまたは出力先ディレクトリが定義されていません。スキップします。")
+                continue
             
-            if not success:
-                logging.warning(f"検索セット {i+1} の実行が失敗しました。次のセットに進みます。")
-        except Exception as e:
-            logging.error(f"検索セット {i+1} の実行中にエラーが発生しました: {str(e)}")
+            # 検索セットのIDを生成
+            search_set_id = '_'.join(keywords)
+            
+            future = executor.submit(run_one, i, keywords, output_dir, max_results, tweet_enabled, search_set_id)
+            futures[future] = i
         
-        # 最後のセット以外は待機
-        if i < len(search_sets) - 1:
-            logging.info(f"{wait_time}秒待機中...")
-            time.sleep(wait_time)
-    
-    # 処理済み論文IDを更新して保存
-    processed_ids.update(all_new_processed_ids)
-    save_processed_ids(processed_ids)
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                success, new_processed_ids = future.result()
+                
+                # 論文IDは各検索セットが処理前にデータベースへ登録済み（念のため、新しく処理した論文IDを追加し直す）
+                if new_processed_ids:
+                    save_processed_ids(processed_db, new_processed_ids)
+                with _state_lock:
+                    all_new_processed_ids.update(new_processed_ids)
+                
+                if not success:
+                    logging.warning(f"検索セット {i+1} の実行が失敗しました。")
+            except Exception as e:
+                logging.error(f"検索セット {i+1} の実行中にエラーが発生しました: {str(e)}")
+    
+    processed_db.close()
     
     # タイムスタンプを保存
     save_timestamps(timestamps)
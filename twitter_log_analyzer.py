@@ -2,12 +2,65 @@
 # -*- coding: utf-8 -*-
 
 import os
-import json
-import glob
+import heapq
 import datetime
 import argparse
 import pandas as pd
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from json_utils import load_json
+
+# ログファイルを並列に読み込むスレッド数
+PARSE_WORKERS = 16
+
+# 論文ごとの投稿情報（タプル）の列名
+PAPER_POST_COLUMNS = ['date', 'title', 'status', 'tweet_count', 'timestamp', 'error']
+
+def list_log_files(log_dir):
+    """
+    Twitter投稿ログファイルの一覧を取得する
+    
+    Args:
+        log_dir (str): ログディレクトリのパス
+        
+    Returns:
+        list: ログファイルのパスのリスト
+    """
+    if not os.path.isdir(log_dir):
+        return []
+    with os.scandir(log_dir) as entries:
+        return [entry.path for entry in entries if entry.name.endswith('_twitter_log.json')]
+
+def _parse_one(log_file):
+    """
+    Twitter投稿ログファイルを1件解析する（ワーカースレッドで実行）
+    
+    Args:
+        log_file (str): ログファイルのパス
+        
+    Returns:
+        tuple: (日付, 状態, 論文の投稿情報（PAPER_POST_COLUMNSの順のタプル）)（タイムスタンプがない場合や解析に失敗した場合はNone）
+    """
+    try:
+        log_data = load_json(log_file)
+        
+        # タイムスタンプを解析
+        timestamp = log_data.get('timestamp')
+        if not timestamp:
+            return None
+        date = timestamp.split()[0]  # YYYY-MM-DD部分を取得
+        title = log_data.get('title', 'Unknown')
+        tweets = log_data.get('tweets') or ()
+        
+        # errorキーがない場合は投稿成功とみなす（web_generatorと同じ判定）
+        failed = 'error' in log_data
+        status = 'Failed' if failed else 'Success'
+        error = log_data['error'] if failed else None
+        
+        return date, status, (date, title, status, len(tweets), timestamp, error)
+    except Exception as e:
+        print(f"ログファイル {log_file} の解析中にエラーが発生しました: {str(e)}")
+        return None
 
 def analyze_twitter_logs(log_dir):
     """
@@ -20,7 +73,7 @@ def analyze_twitter_logs(log_dir):
         dict: 分析結果
     """
     # ログファイルを取得
-    log_files = glob.glob(os.path.join(log_dir, "*_twitter_log.json"))
+    log_files = list_log_files(log_dir)
     
     if not log_files:
         print("ログファイルが見つかりません。")
@@ -31,40 +84,17 @@ def analyze_twitter_logs(log_dir):
     # 論文ごとの投稿情報
     paper_posts = []
     
-    for log_file in log_files:
-        try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                log_data = json.load(f)
+    # ログファイルを並列に解析し、結果はメインスレッドで集計する
+    with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+        for parsed in executor.map(_parse_one, log_files):
+            if parsed is None:
+                continue
+            date, status, paper_post = parsed
+            if status == 'Success':
+                daily_posts[date] += 1
             
-            # タイムスタンプを解析
-            timestamp = log_data.get('timestamp')
-            if timestamp:
-                date = timestamp.split()[0]  # YYYY-MM-DD部分を取得
-                
-                # エラーがない場合は投稿成功とみなす
-                if 'error' not in log_data:
-                    daily_posts[date] += 1
-                    
-                    # 論文情報を追加
-                    paper_posts.append({
-                        'date': date,
-                        'title': log_data.get('title', 'Unknown'),
-                        'status': 'Success',
-                        'tweet_count': len(log_data.get('tweets', [])),
-                        'timestamp': timestamp
-                    })
-                else:
-                    # エラーがある場合
-                    paper_posts.append({
-                        'date': date,
-                        'title': log_data.get('title', 'Unknown'),
-                        'status': 'Failed',
-                        'error': log_data.get('error', 'Unknown error'),
-                        'tweet_count': len(log_data.get('tweets', [])),
-                        'timestamp': timestamp
-                    })
-        except Exception as e:
-            print(f"ログファイル {log_file} の解析中にエラーが発生しました: {str(e)}")
+            # 論文情報を追加
+            paper_posts.append(paper_post)
     
     # 結果を整形
     result = {
@@ -78,50 +108,63 @@ def analyze_twitter_logs(log_dir):
     
     return result
 
-def generate_daily_summary(log_dir, output_file=None):
+def generate_daily_summary(log_dir, output_file=None, result=None):
     """
     日次サマリーを生成する
     
     Args:
-        log_dir (str): ログディレクトリのパス
+        log_dir (str): ログディレクトリのパス（resultを渡す場合はNoneでよい）
         output_file (str, optional): 出力ファイルパス
+        result (dict, optional): analyze_twitter_logsの分析結果（省略時はlog_dirのログを分析する）
         
     Returns:
         str: サマリーテキスト
     """
-    result = analyze_twitter_logs(log_dir)
+    if result is None and log_dir is not None:
+        result = analyze_twitter_logs(log_dir)
     
     if not result:
         return "データがありません。"
     
-    # 日次サマリーを作成
-    summary = "# Twitter投稿サマリー\n\n"
-    summary += f"分析日時: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-    
-    summary += "## 投稿統計\n\n"
-    summary += f"- 総投稿数: {result['total_posts']}件\n"
-    summary += f"- 投稿日数: {result['total_days']}日\n"
-    summary += f"- 初回投稿日: {result['first_date']}\n"
-    summary += f"- 最終投稿日: {result['last_date']}\n\n"
-    
-    summary += "## 日別投稿数\n\n"
-    summary += "日付 | 投稿数\n"
-    summary += "---- | ------\n"
+    # 日次サマリーを作成（行をリストに集めて最後に結合する）
+    lines = [
+        "# Twitter投稿サマリー",
+        "",
+        f"分析日時: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        "## 投稿統計",
+        "",
+        f"- 総投稿数: {result['total_posts']}件",
+        f"- 投稿日数: {result['total_days']}日",
+        f"- 初回投稿日: {result['first_date']}",
+        f"- 最終投稿日: {result['last_date']}",
+        "",
+        "## 日別投稿数",
+        "",
+        "日付 | 投稿数",
+        "---- | ------",
+    ]
     
     # 日付でソート
-    sorted_dates = sorted(result['daily_posts'].keys(), reverse=True)
-    for date in sorted_dates:
-        summary += f"{date} | {result['daily_posts'][date]}\n"
-    
-    summary += "\n## 最近の投稿\n\n"
-    summary += "日時 | タイトル | 状態 | ツイート数\n"
-    summary += "---- | ------- | ---- | ---------\n"
+    daily_posts = result['daily_posts']
+    sorted_dates = sorted(daily_posts, reverse=True)
+    lines.extend(f"{date} | {daily_posts[date]}" for date in sorted_dates)
+    
+    lines.extend([
+        "",
+        "## 最近の投稿",
+        "",
+        "日時 | タイトル | 状態 | ツイート数",
+        "---- | ------- | ---- | ---------",
+    ])
     
     # 最新の投稿10件を表示
-    recent_posts = sorted(result['paper_posts'], key=lambda x: x['timestamp'], reverse=True)[:10]
-    for post in recent_posts:
-        status = "✅ 成功" if post['status'] == 'Success' else "❌ 失敗"
-        summary += f"{post['timestamp']} | {post['title'][:50]}... | {status} | {post['tweet_count']}\n"
+    recent_posts = heapq.nlargest(10, result['paper_posts'], key=lambda x: x[4])
+    for date, title, status, tweet_count, timestamp, error in recent_posts:
+        status_label = "✅ 成功" if status == 'Success' else "❌ 失敗"
+        lines.append(f"{timestamp} | {title[:50]}... | {status_label} | {tweet_count}")
+    
+    summary = "\n".join(lines) + "\n"
     
     # 出力ファイルに保存
     if output_file:
@@ -131,22 +174,24 @@ def generate_daily_summary(log_dir, output_file=None):
     
     return summary
 
-def export_to_csv(log_dir, output_file):
+def export_to_csv(log_dir, output_file, result=None):
     """
     投稿ログをCSVファイルにエクスポートする
     
     Args:
-        log_dir (str): ログディレクトリのパス
+        log_dir (str): ログディレクトリのパス（resultを渡す場合はNoneでよい）
         output_file (str): 出力ファイルパス
+        result (dict, optional): analyze_twitter_logsの分析結果（省略時はlog_dirのログを分析する）
     """
-    result = analyze_twitter_logs(log_dir)
+    if result is None and log_dir is not None:
+        result = analyze_twitter_logs(log_dir)
     
     if not result or not result['paper_posts']:
         print("エクスポートするデータがありません。")
         return
     
     # DataFrameに変換
-    df = pd.DataFrame(result['paper_posts'])
+    df = pd.DataFrame(result['paper_posts'], columns=PAPER_POST_COLUMNS)
     
     # CSVに保存
     df.to_csv(output_file, index=False, encoding='utf-8')
@@ -175,15 +220,18 @@ def main():
     
     args = parser.parse_args()
     
+    # ログを一度だけ分析し、サマリーとCSVで共有する
+    result = analyze_twitter_logs(args.log_dir)
+    
     # サマリーを生成
-    summary = generate_daily_summary(args.log_dir, args.output)
+    summary = generate_daily_summary(None, args.output, result=result)
     
     if not args.output:
         print(summary)
     
     # CSVにエクスポート
     if args.csv:
-        export_to_csv(args.log_dir, args.csv)
+        export_to_csv(None, args.csv, result=result)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,10 +2,50 @@
 # -*- coding: utf-8 -*-
 
 import os
-import json
 import time
 import logging
+import threading
 import tweepy
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from json_utils import dump_json
+
+# 認証情報ごとのtweepy Client（get_twitter_clientで初期化）
+_client_cache = {}
+
+# まとめて投稿する場合の同時投稿数と、一定時間あたりの最大投稿数（設定で上書き可能）
+DEFAULT_POST_CONCURRENCY = 4
+DEFAULT_POSTS_PER_WINDOW = 50
+DEFAULT_RATE_WINDOW = 15 * 60
+
+# 直近の投稿時刻（wait_for_post_slotで更新）
+_post_rate_lock = threading.Lock()
+_post_times = deque()
+
+def get_twitter_client(ck, cs, at, ats):
+    """
+    tweepy Clientを取得する（認証情報ごとに一度だけ生成し、HTTP接続を使い回す）
+    
+    Args:
+        ck (str): APIキー
+        cs (str): APIキーシークレット
+        at (str): アクセストークン
+        ats (str): アクセストークンシークレット
+    
+    Returns:
+        tweepy.Client: tweepy Client
+    """
+    key = (ck, cs, at, ats)
+    client = _client_cache.get(key)
+    if client is None:
+        client = tweepy.Client(
+            consumer_key=ck,
+            consumer_secret=cs,
+            access_token=at,
+            access_token_secret=ats
+        )
+        _client_cache[key] = client
+    return client
 
 def post_thread(config, summary, log_dir):
     """
@@ -30,6 +70,10 @@ def post_thread(config, summary, log_dir):
     else:
         log_path = os.path.join(log_dir, f"{summary['title'].replace(' ', '_')[:30]}_twitter_log.json")
     
+    # ログのタイムスタンプ（成功・失敗どちらのログでも使う。形式はtwitter_log_analyzer/web_generatorが解析する）
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    tweets = []
+    
     try:
         # Twitter APIの認証情報
         ck = config['api_key']
@@ -37,15 +81,8 @@ def post_thread(config, summary, log_dir):
         at = config['access_token']
         ats = config['access_token_secret']
         
-        # tweepy Clientを初期化
-        client = tweepy.Client(
-            consumer_key=ck,
-            consumer_secret=cs,
-            access_token=at,
-            access_token_secret=ats
-        )
-        
-        tweets = []
+        # tweepy Clientを取得
+        client = get_twitter_client(ck, cs, at, ats)
         
         # arXiv IDを取得
         arxiv_id = None
@@ -62,7 +99,7 @@ def post_thread(config, summary, log_dir):
             if len(post_text) + len(arxiv_url) + 2 <= 280:  # 改行分の2文字を追加
                 post_text += f"\n\n{arxiv_url}"
         
-        logging.info(f"ツイートを投稿中: {post_text}")
+        logging.info("ツイートを投稿中: %s", post_text)
         tweet_response = client.create_tweet(text=post_text)
         tweet_id = tweet_response.data['id']
         tweets.append({
@@ -74,7 +111,7 @@ def post_thread(config, summary, log_dir):
         # ログを保存
         log_data = {
             "title": summary['title'],
-            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": timestamp,
             "summary": summary['summary'],
             "tweets": tweets
         }
@@ -83,10 +120,9 @@ def post_thread(config, summary, log_dir):
         if arxiv_id:
             log_data["arxiv_id"] = arxiv_id
         
-        with open(log_path, 'w', encoding='utf-8') as f:
-            json.dump(log_data, f, ensure_ascii=False, indent=2)
+        dump_json(log_data, log_path)
         
-        logging.info(f"Twitter投稿成功: {summary['title']}")
+        logging.info("Twitter投稿成功: %s", summary['title'])
         # コンソールにも出力
         print(f"Twitter投稿成功: {summary['title']}")
         return True
@@ -106,17 +142,66 @@ def post_thread(config, summary, log_dir):
         # エラーログを保存
         error_log = {
             "title": summary['title'],
-            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": timestamp,
             "summary": summary.get('summary', ''),
             "error": str(e),
-            "tweets": tweets if 'tweets' in locals() else []
+            "tweets": tweets
         }
         
         # arXiv IDがある場合は追加
         if 'arxiv_id' in summary:
             error_log["arxiv_id"] = summary['arxiv_id']
         
-        with open(log_path, 'w', encoding='utf-8') as f:
-            json.dump(error_log, f, ensure_ascii=False, indent=2)
+        dump_json(error_log, log_path)
         
-        return False
\ No newline at end of file
+        return False
+
+def wait_for_post_slot(posts_per_window=DEFAULT_POSTS_PER_WINDOW, window=DEFAULT_RATE_WINDOW):
+    """
+    直近window秒間の投稿数がposts_per_window件未満になるまで待機する（スライディングウィンドウ）
+    
+    Args:
+        posts_per_window (int): window秒あたりの最大投稿数
+        window (float): ウィンドウの長さ（秒）
+    """
+    with _post_rate_lock:
+        while True:
+            now = time.monotonic()
+            while _post_times and now - _post_times[0] >= window:
+                _post_times.popleft()
+            if len(_post_times) < posts_per_window:
+                _post_times.append(now)
+                return
+            wait_time = window - (now - _post_times[0])
+            logging.info("Twitterの投稿数制限のため%.1f秒待機します", wait_time)
+            time.sleep(wait_time)
+
+def post_threads_batch(config, summaries, log_dir):
+    """
+    複数の要約をスレッドプールで並行してTwitterに投稿する
+    
+    通常の実行（arxiv_downloader）は1回に1件しか投稿しないため、この関数は使わない。
+    まとめて投稿するスクリプトから呼び出す場合は、configの次のキーで投稿の並列度とペースを調整できる
+    
+    - post_concurrency: 同時に投稿する数（デフォルト: DEFAULT_POST_CONCURRENCY）
+    - posts_per_window: rate_window秒あたりの最大投稿数（デフォルト: DEFAULT_POSTS_PER_WINDOW）
+    - rate_window: 投稿数を数える期間（秒、デフォルト: DEFAULT_RATE_WINDOW）
+    
+    Args:
+        config (dict): Twitter API設定（APIキー、トークン、上記の投稿設定など）
+        summaries (list): 投稿する要約のリスト
+        log_dir (str): ログ出力先ディレクトリ
+    
+    Returns:
+        list: 要約ごとの投稿が成功したかどうか（summariesと同じ順番）
+    """
+    max_workers = max(1, config.get('post_concurrency', DEFAULT_POST_CONCURRENCY))
+    posts_per_window = config.get('posts_per_window', DEFAULT_POSTS_PER_WINDOW)
+    window = config.get('rate_window', DEFAULT_RATE_WINDOW)
+    
+    def post_one(summary):
+        wait_for_post_slot(posts_per_window, window)
+        return post_thread(config, summary, log_dir)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(post_one, summaries))
\ No newline at end of file
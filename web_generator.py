@@ -2,45 +2,400 @@
 # -*- coding: utf-8 -*-
 
 import os
-import json
-import glob
+import re
+import heapq
+import hashlib
+import gzip
 import time
+import sqlite3
 import logging
 from datetime import datetime
 import shutil
+import multiprocessing
 from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import jinja2
+from markupsafe import escape
+from json_utils import load_json, dump_json, dumps_json, loads_json
 
-def classify_logs_by_date(log_files):
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ページのテンプレート（templatesディレクトリ。一度コンパイルしたものを使い回す）
+# layout.html: 全ページ共通のレイアウト
+# card.html: 論文カード（日付別ページとメインインデックスで共有）
+# papers.html: 論文カードを並べたページ（日付別ページ、メインインデックス）
+# archive.html: 月別・年別インデックス
+TEMPLATE_DIR = os.path.join(_SCRIPT_DIR, 'templates')
+
+_ENV = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+    autoescape=True,
+    trim_blocks=True,
+    cache_size=-1
+)
+
+# Webページ用のカスタムCSS
+_CUSTOM_CSS = """
+        .paper-card {
+            margin-bottom: 20px;
+            transition: transform 0.2s;
+        }
+        .paper-card:hover {
+            transform: translateY(-5px);
+            box-shadow: 0 10px 20px rgba(0,0,0,0.1);
+        }
+        .summary-text {
+            cursor: pointer;
+        }
+        .paper-title {
+            cursor: pointer;
+        }
+        .arxiv-link {
+            font-size: 0.8rem;
+            color: #6c757d;
+            margin-top: -5px;
+            margin-bottom: 10px;
+            display: block;
+        }
+        .arxiv-link a {
+            color: #6c757d;
+            text-decoration: none;
+            cursor: pointer;
+        }
+        .arxiv-link a:hover {
+            text-decoration: underline;
+        }
+        @media (max-width: 768px) {
+            .container {
+                padding-left: 10px;
+                padding-right: 10px;
+            }
+        }
+        """
+
+# Webページ用のカスタムJS
+_CUSTOM_JS = """
+        document.addEventListener('DOMContentLoaded', function() {
+            // クリップボードにコピーする関数
+            function copyToClipboard(text) {
+                // テキストエリアを作成
+                const textarea = document.createElement('textarea');
+                textarea.value = text;
+                
+                // スタイルを設定して画面外に配置
+                textarea.style.position = 'fixed';
+                textarea.style.opacity = 0;
+                document.body.appendChild(textarea);
+                
+                // テキストを選択してコピー
+                textarea.select();
+                let success = false;
+                
+                try {
+                    // execCommandを試す
+                    success = document.execCommand('copy');
+                } catch (err) {
+                    console.error('コピーに失敗しました:', err);
+                }
+                
+                // テキストエリアを削除
+                document.body.removeChild(textarea);
+                
+                // 新しいClipboard APIも試す（execCommandが失敗した場合）
+                if (!success && navigator.clipboard) {
+                    navigator.clipboard.writeText(text).catch(err => {
+                        console.error('Clipboard APIでのコピーに失敗しました:', err);
+                    });
+                    success = true;
+                }
+                
+                return success;
+            }
+            
+            // 成功メッセージを表示
+            function showCopySuccess(element) {
+                if (!element) return;
+                
+                element.classList.add('show');
+                setTimeout(() => {
+                    element.classList.remove('show');
+                }, 2000);
+            }
+            
+            // モーダルを表示する関数
+            function showCopyModal() {
+                const copyModal = new bootstrap.Modal(document.getElementById('copyModal'));
+                copyModal.show();
+                
+                // 2秒後に自動的に閉じる
+                setTimeout(() => {
+                    copyModal.hide();
+                }, 2000);
+            }
+            
+            // 要約文のクリップボードコピー機能
+            document.querySelectorAll('.summary-text').forEach(function(element) {
+                element.addEventListener('click', function() {
+                    const text = this.textContent;
+                    const success = copyToClipboard(text);
+                    
+                    if (success) {
+                        showCopyModal();
+                    } else {
+                        console.error('要約文のコピーに失敗しました。');
+                    }
+                });
+            });
+            
+            // タイトルのクリップボードコピー機能
+            document.querySelectorAll('.paper-title').forEach(function(element) {
+                element.addEventListener('click', function() {
+                    const text = this.textContent;
+                    const success = copyToClipboard(text);
+                    
+                    if (success) {
+                        showCopyModal();
+                    } else {
+                        console.error('タイトルのコピーに失敗しました。');
+                    }
+                });
+            });
+            
+            // URLのクリップボードコピー機能
+            document.querySelectorAll('.copy-url').forEach(function(element) {
+                element.addEventListener('click', function(e) {
+                    e.preventDefault();
+                    const url = this.getAttribute('data-url');
+                    const success = copyToClipboard(url);
+                    
+                    if (success) {
+                        showCopyModal();
+                    } else {
+                        console.error('URLのコピーに失敗しました。');
+                    }
+                });
+            });
+        });
+        """
+
+# ツイート内容などからarXiv IDを抽出する正規表現
+_ARXIV_ID_RE = re.compile(r'https://arxiv\.org/abs/(\d+\.\d+v\d+)')
+
+# _ARXIV_ID_REが一致する文字列に必ず含まれる部分（正規表現を実行する前の絞り込みに使う）
+_ARXIV_URL_PREFIX = 'arxiv.org/abs/'
+
+# ログファイルを並列に読み込むスレッド数
+PARSE_WORKERS = 16
+
+# ログのタイムスタンプ（YYYY-MM-DD HH:MM:SS）
+_TIMESTAMP_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):\d{2}')
+
+# 全ページ生成時に日付別ページを並列に生成するワーカープロセス数
+PAGE_WORKERS = os.cpu_count() or 1
+
+# 生成するページがこの件数未満の場合はワーカープロセスを使わずにその場で生成する
+# （1ページの生成は数ミリ秒で、プロセスの起動とモジュールの読み込みの方が時間がかかるため）
+PAGE_POOL_MIN_TASKS = 4 * PAGE_WORKERS
+
+# 全ページ生成時に、各ページの生成元のフィンガープリントを記録するファイル（出力先ディレクトリ内）
+PAGE_CACHE_NAME = '.page_cache.json'
+
+# --gzip指定時に作成する圧縮済みページ（.gz）の圧縮レベル（生成時に一度だけ圧縮するので最大にする）
+GZIP_LEVEL = 9
+
+# ページを書き込むときにまとめて書き込む単位（バイト）
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# ログファイルの解析結果を保存するインデックス（ログディレクトリ内に作成）
+LOG_INDEX_NAME = 'logs.db'
+
+# インデックスに保存しない論文情報のキー（読み込み時にエスケープし直す）
+_HTML_FIELDS = ('title_html', 'summary_html')
+
+def list_log_files(log_dir):
+    """
+    Twitter投稿ログファイルの一覧を最終更新時刻とともに取得する
+    
+    最終更新時刻はディレクトリの走査で得たDirEntryから取得し、ファイルごとにパスを組み立ててstatし直さない
+    
+    Args:
+        log_dir (str): ログディレクトリのパス
+        
+    Returns:
+        dict: ログファイルのパス -> 最終更新時刻（ファイル名順）
+    """
+    if not os.path.isdir(log_dir):
+        return {}
+    log_files = {}
+    with os.scandir(log_dir) as it:
+        entries = sorted(
+            (entry for entry in it if entry.name.endswith('_twitter_log.json') and entry.is_file(follow_symlinks=False)),
+            key=lambda entry: entry.name
+        )
+    for entry in entries:
+        try:
+            log_files[entry.path] = entry.stat(follow_symlinks=False).st_mtime
+        except FileNotFoundError:
+            continue
+    return log_files
+
+def open_log_index(db_path):
+    """
+    ログファイルの解析結果のインデックス（SQLite）を開く
+    
+    Args:
+        db_path (str): データベースファイルのパス
+        
+    Returns:
+        sqlite3.Connection: データベース接続
+    """
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS logs (path TEXT PRIMARY KEY, mtime REAL, paper_json TEXT, date TEXT)")
+    return conn
+
+def classify_logs_by_date(log_files, date_sources=None, log_index=None):
     """
     ログファイルを日付ごとに分類する
     
     Args:
-        log_files (list): ログファイルのパスのリスト
+        log_files (dict): ログファイルのパス -> 最終更新時刻（list_log_filesの戻り値）
+        date_sources (dict, optional): 日付ごとのログファイルの(パス, 最終更新時刻)のリストを格納する辞書
+        log_index (sqlite3.Connection, optional): ログファイルの解析結果のインデックス（指定した場合は新規・変更されたログファイルのみ解析する）
         
     Returns:
         dict: 日付ごとのログデータのリスト
     """
+    if log_index is not None:
+        return _classify_logs_with_index(log_files, log_index, date_sources)
+    
     date_logs = defaultdict(list)
     
-    for log_file in log_files:
-        try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                log_data = json.load(f)
-            
-            # タイムスタンプを解析
-            timestamp = log_data.get('timestamp')
-            if timestamp:
-                date = timestamp.split()[0]  # YYYY-MM-DD
-                
-                # 論文情報を作成
-                paper_info = process_log_data(log_file, log_data)
-                if paper_info:
-                    date_logs[date].append(paper_info)
-        except Exception as e:
-            logging.error(f"ログファイル {log_file} の解析エラー: {str(e)}")
+    # ログファイルを並列に読み込み、結果はメインスレッドで集計する
+    with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+        for log_file, loaded in zip(log_files, executor.map(_load_one_log, log_files, chunksize=32)):
+            if loaded is None:
+                continue
+            date, paper_info = loaded
+            date_logs[date].append(paper_info)
+            if date_sources is not None:
+                date_sources.setdefault(date, []).append((log_file, log_files[log_file]))
     
     return date_logs
 
+def _classify_logs_with_index(log_files, log_index, date_sources=None):
+    """
+    インデックスを更新してからログファイルを日付ごとに分類する
+    
+    最終更新時刻がインデックスと異なるログファイルのみ解析して1つのトランザクションで書き込み、
+    削除されたログファイルの行は取り除く。日付ごとの分類はインデックスから組み立てる
+    
+    Args:
+        log_files (dict): ログファイルのパス -> 最終更新時刻（list_log_filesの戻り値）
+        log_index (sqlite3.Connection): ログファイルの解析結果のインデックス
+        date_sources (dict, optional): 日付ごとのログファイルの(パス, 最終更新時刻)のリストを格納する辞書
+        
+    Returns:
+        dict: 日付ごとのログデータのリスト
+    """
+    indexed = dict(log_index.execute("SELECT path, mtime FROM logs"))
+    
+    changed = [log_file for log_file, mtime in log_files.items() if indexed.get(log_file) != mtime]
+    removed = [(path,) for path in indexed if path not in log_files]
+    
+    # 新規・変更されたログファイルのみ並列に解析する
+    rows = []
+    with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+        for log_file, loaded in zip(changed, executor.map(_load_one_log, changed, chunksize=32)):
+            if loaded is None:
+                # 解析できなかったログファイルも記録し、変更されるまで再解析しない
+                rows.append((log_file, log_files[log_file], None, None))
+                continue
+            date, paper_info = loaded
+            paper_json = dumps_json({key: value for key, value in paper_info.items() if key not in _HTML_FIELDS})
+            rows.append((log_file, log_files[log_file], paper_json, date))
+    
+    if rows or removed:
+        with log_index:
+            log_index.executemany("DELETE FROM logs WHERE path = ?", removed)
+            log_index.executemany("INSERT OR REPLACE INTO logs (path, mtime, paper_json, date) VALUES (?, ?, ?, ?)", rows)
+    logging.info("ログファイル: %s件を解析しました（%s件は変更なし、%s件を削除）", len(changed), len(log_files) - len(changed), len(removed))
+    
+    date_logs = defaultdict(list)
+    for path, date, paper_json, mtime in log_index.execute(
+            "SELECT path, date, paper_json, mtime FROM logs WHERE date IS NOT NULL ORDER BY path"):
+        date_logs[date].append(_add_html_fields(loads_json(paper_json)))
+        if date_sources is not None:
+            date_sources.setdefault(date, []).append((path, mtime))
+    
+    return date_logs
+
+def _load_one_log(log_file):
+    """
+    ログファイルを1件読み込み、論文情報を作成する（ワーカースレッドで実行）
+    
+    Args:
+        log_file (str): ログファイルのパス
+        
+    Returns:
+        tuple: (日付（YYYY-MM-DD）, 論文情報)（タイムスタンプがない場合や解析に失敗した場合はNone）
+    """
+    try:
+        log_data = load_json(log_file)
+        
+        # タイムスタンプを解析
+        timestamp = log_data.get('timestamp')
+        if timestamp:
+            date = timestamp.split()[0]  # YYYY-MM-DD
+            
+            # 論文情報を作成
+            paper_info = process_log_data(log_file, log_data)
+            if paper_info:
+                return date, paper_info
+    except Exception as e:
+        logging.error("ログファイル %s の解析エラー: %s", log_file, e)
+    return None
+
+@lru_cache(maxsize=65536)
+def format_timestamp(timestamp):
+    """
+    ログのタイムスタンプ（YYYY-MM-DD HH:MM:SS）を表示用の日時（YYYY年MM月DD日 HH:MM）に変換する
+    
+    固定長の形式なので、strptimeを使わずに正規表現で切り出して変換する。
+    同じタイムスタンプのログが多いため、変換結果はキャッシュする
+    
+    Args:
+        timestamp (str): タイムスタンプ
+        
+    Returns:
+        str: 表示用の日時（形式が異なる場合はstrptimeで解析し、それも失敗した場合はタイムスタンプのまま）
+    """
+    match = _TIMESTAMP_RE.fullmatch(timestamp)
+    if match:
+        return "{}年{}月{}日 {}:{}".format(*match.groups())
+    
+    try:
+        date_obj = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+        return date_obj.strftime("%Y年%m月%d日 %H:%M")
+    except ValueError:
+        return timestamp
+
+def _add_html_fields(paper_info):
+    """
+    HTMLに埋め込むタイトルと要約文を一度だけエスケープしておく（論文が複数のページに載っても再エスケープしない）
+    
+    Args:
+        paper_info (dict): 論文情報
+        
+    Returns:
+        dict: エスケープ済みのタイトルと要約文を追加した論文情報
+    """
+    paper_info['title_html'] = escape(paper_info['title'])
+    paper_info['summary_html'] = escape(paper_info['summary'])
+    return paper_info
+
 def process_log_data(log_file, log_data):
     """
     ログデータから論文情報を抽出する
@@ -58,33 +413,28 @@ def process_log_data(log_file, log_data):
         if not timestamp:
             return None
         
-        # 日時オブジェクトに変換
-        try:
-            date_obj = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
-            formatted_date = date_obj.strftime("%Y年%m月%d日 %H:%M")
-        except ValueError:
-            formatted_date = timestamp
+        # 表示用の日時に変換
+        formatted_date = format_timestamp(timestamp)
         
         # arXiv IDを取得
         arxiv_id = log_data.get('arxiv_id')
         
         # ログデータにarXiv IDがない場合は、ツイート内容から抽出を試みる
         if not arxiv_id:
-            import re
-            
             # ツイート内容から抽出
             if 'tweets' in log_data and log_data['tweets']:
                 for tweet in log_data['tweets']:
-                    if 'text' in tweet:
+                    # URLを含まないツイートでは正規表現を実行しない
+                    if 'text' in tweet and _ARXIV_URL_PREFIX in tweet['text']:
                         # ツイート内容からarXiv URLを検索
-                        url_match = re.search(r'https://arxiv\.org/abs/(\d+\.\d+v\d+)', tweet['text'])
+                        url_match = _ARXIV_ID_RE.search(tweet['text'])
                         if url_match:
                             arxiv_id = url_match.group(1)
                             break
             
             # post_textから抽出
-            if not arxiv_id and 'post_text' in log_data:
-                url_match = re.search(r'https://arxiv\.org/abs/(\d+\.\d+v\d+)', log_data['post_text'])
+            if not arxiv_id and _ARXIV_URL_PREFIX in log_data.get('post_text', ''):
+                url_match = _ARXIV_ID_RE.search(log_data['post_text'])
                 if url_match:
                     arxiv_id = url_match.group(1)
         
@@ -110,6 +460,8 @@ def process_log_data(log_file, log_data):
         if 'summary' not in paper_info:
             paper_info['summary'] = '要約情報がありません。'
         
+        _add_html_fields(paper_info)
+        
         # エラーがない場合は投稿成功とみなす
         if 'error' not in log_data:
             paper_info['status'] = 'Success'
@@ -128,10 +480,116 @@ def process_log_data(log_file, log_data):
         return paper_info
     
     except Exception as e:
-        logging.error(f"ログファイル {log_file} の処理中にエラーが発生しました: {str(e)}")
+        logging.error("ログファイル %s の処理中にエラーが発生しました: %s", log_file, e)
         return None
 
-def generate_daily_page(date, papers, output_dir):
+def write_page(file_path, html):
+    """
+    生成したHTMLをファイルに書き込む（テキストI/O層を通さず、UTF-8のバイト列をそのまま書き込む）
+    
+    Args:
+        file_path (str): 出力先ファイルのパス
+        html (str or iterable): 書き込むHTML（文字列、またはテンプレートのストリームなどHTMLの断片を順に返すイテラブル）
+    
+    Returns:
+        int: 書き込んだバイト数
+    """
+    chunks = (html,) if isinstance(html, str) else html
+    size = 0
+    # ストリームの断片は小さいので、WRITE_BUFFER_SIZEまで溜めてからまとめて書き込む
+    buffer = bytearray()
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        for chunk in chunks:
+            buffer += chunk.encode('utf-8')
+            if len(buffer) >= WRITE_BUFFER_SIZE:
+                size += _write_all(fd, buffer)
+                buffer.clear()
+        if buffer:
+            size += _write_all(fd, buffer)
+    finally:
+        os.close(fd)
+    return size
+
+def _write_all(fd, data):
+    """
+    バイト列を全てファイルディスクリプタに書き込む
+    
+    Args:
+        fd (int): ファイルディスクリプタ
+        data (bytes-like): 書き込むバイト列
+    
+    Returns:
+        int: 書き込んだバイト数
+    """
+    size = len(data)
+    view = memoryview(data)
+    try:
+        # os.writeは一部しか書き込まないことがあるので、全て書き込むまで繰り返す
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        view.release()
+    return size
+
+def write_if_changed(file_path, content):
+    """
+    ファイルの内容が異なる場合のみ書き込む
+    
+    Args:
+        file_path (str): 出力先ファイルのパス
+        content (str): 書き込む内容
+        
+    Returns:
+        bool: 書き込んだかどうか
+    """
+    data = content.encode('utf-8')
+    try:
+        with open(file_path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    
+    with open(file_path, 'wb') as f:
+        f.write(data)
+    return True
+
+def group_dates(date_logs):
+    """
+    日付ごとのログデータを年・年月ごとにまとめる（インデックスページごとに全日付を走査しないようにする）
+    
+    Args:
+        date_logs (dict): 日付ごとのログデータ
+        
+    Returns:
+        dict: 年の一覧（新しい順）、年月ごとの日付（新しい順）、年ごとの月（新しい順）、日付ごと・年月ごと・年ごとの論文数
+    """
+    dates = defaultdict(list)
+    month_counts = defaultdict(int)
+    year_counts = defaultdict(int)
+    
+    for date, papers in date_logs.items():
+        year, month = date[:4], date[5:7]
+        dates[(year, month)].append(date)
+        month_counts[(year, month)] += len(papers)
+        year_counts[year] += len(papers)
+    
+    months = defaultdict(list)
+    for year, month in dates:
+        months[year].append(month)
+    
+    return {
+        'years': sorted(year_counts, reverse=True),
+        'dates': {key: sorted(values, reverse=True) for key, values in dates.items()},
+        'months': {year: sorted(values, reverse=True) for year, values in months.items()},
+        'date_counts': {date: len(papers) for date, papers in date_logs.items()},
+        'month_counts': dict(month_counts),
+        'year_counts': dict(year_counts),
+    }
+
+def generate_daily_page(date, papers, output_dir, updated_at):
     """
     日付ごとのページを生成する
     
@@ -139,378 +597,290 @@ def generate_daily_page(date, papers, output_dir):
         date (str): 日付（YYYY-MM-DD）
         papers (list): 論文データのリスト
         output_dir (str): 出力先ディレクトリのパス
+        updated_at (str): ページに表示する最終更新日時
         
     Returns:
-        str: 生成されたファイルのパス
+        tuple: (生成されたファイルのパス, ファイルのサイズ（バイト）)
     """
     # 年月日を分解
-    year, month, day = date.split('-')
+    year, month, day = date[:4], date[5:7], date[8:10]
     
-    # ナビゲーションリンクを作成
-    nav_html = f"""
-    <nav aria-label="breadcrumb">
-      <ol class="breadcrumb">
-        <li class="breadcrumb-item"><a href="index.html">ホーム</a></li>
-        <li class="breadcrumb-item"><a href="{year}.html">{year}年</a></li>
-        <li class="breadcrumb-item"><a href="{year}-{month}.html">{year}年{month}月</a></li>
-        <li class="breadcrumb-item active" aria-current="page">{year}年{month}月{day}日</li>
-      </ol>
-    </nav>
-    """
+    # パンくずリストを作成
+    breadcrumbs = [("index.html", "ホーム"), (f"{year}.html", f"{year}年"), (f"{year}-{month}.html", f"{year}年{month}月")]
     
-    # HTMLを生成
-    html = generate_html_template(f"{year}年{month}月{day}日の論文要約", papers, nav_html)
+    # HTMLを生成（ページ全体を1つの文字列にせず、断片ごとにファイルへ書き込む）
+    html = stream_html_template(f"{year}年{month}月{day}日の論文要約", papers, updated_at, breadcrumbs, f"{year}年{month}月{day}日")
     
     # ファイルに保存
     file_path = os.path.join(output_dir, f"{date}.html")
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+    size = write_page(file_path, html)
     
-    return file_path
+    return file_path, size
 
-def generate_monthly_index(year, month, date_logs, output_dir):
+def page_fingerprint(sources):
     """
-    月別インデックスページを生成する
+    ページの生成元からフィンガープリントを作成する
+    
+    Args:
+        sources (list): ページの生成元（ログファイルの(パス, 最終更新時刻)や、リンク先ごとの論文数など）
+        
+    Returns:
+        str: フィンガープリント（16バイトのBLAKE2bの16進数表記）
+    """
+    return hashlib.blake2b(repr(sources).encode('utf-8'), digest_size=16).hexdigest()
+
+def load_page_cache(output_dir):
+    """
+    前回の全ページ生成時のフィンガープリントを読み込む
     
     Args:
-        year (str): 年（YYYY）
-        month (str): 月（MM）
-        date_logs (dict): 日付ごとのログデータ
         output_dir (str): 出力先ディレクトリのパス
         
     Returns:
-        str: 生成されたファイルのパス
-    """
-    # 月内の日付リンクリスト
-    date_links = []
-    for date in sorted([d for d in date_logs.keys() if d.startswith(f"{year}-{month}")], reverse=True):
-        y, m, d = date.split('-')
-        date_links.append(f'<li><a href="{date}.html">{y}年{m}月{d}日</a> ({len(date_logs[date])}件)</li>')
-    
-    # ナビゲーションリンクを作成
-    nav_html = f"""
-    <nav aria-label="breadcrumb">
-      <ol class="breadcrumb">
-        <li class="breadcrumb-item"><a href="index.html">ホーム</a></li>
-        <li class="breadcrumb-item"><a href="{year}.html">{year}年</a></li>
-        <li class="breadcrumb-item active" aria-current="page">{year}年{month}月</li>
-      </ol>
-    </nav>
-    """
-    
-    # HTMLを生成
-    html = f"""<!DOCTYPE html>
-    <html lang="ja">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{year}年{month}月の論文要約</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/css/bootstrap.min.css" rel="stylesheet">
-        <link rel="stylesheet" href="css/custom.css">
-    </head>
-    <body>
-        <div class="container py-4">
-            <header class="pb-3 mb-4 border-bottom">
-                <div class="d-flex align-items-center text-dark text-decoration-none">
-                    <span class="fs-4">{year}年{month}月の論文要約</span>
-                    <span class="ms-auto">最終更新: {datetime.now().strftime('%Y年%m月%d日 %H:%M')}</span>
-                </div>
-            </header>
-            
-            {nav_html}
-            
-            <div class="alert alert-info">
-                <p><strong>C(・ω・ )つ みんなー！</strong> {year}年{month}月の論文要約一覧だよ！</p>
-            </div>
-            
-            <div class="row">
-                <div class="col-md-12">
-                    <div class="card">
-                        <div class="card-header">
-                            日別アーカイブ
-                        </div>
-                        <div class="card-body">
-                            <ul>
-                                {"".join(date_links)}
-                            </ul>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
+        dict: ページのファイル名 -> フィンガープリント（ファイルがない場合や読み込めない場合は空の辞書）
+    """
+    try:
+        return load_json(os.path.join(output_dir, PAGE_CACHE_NAME))
+    except (OSError, ValueError):
+        return {}
+
+def save_page_cache(output_dir, page_cache):
+    """
+    全ページ生成時のフィンガープリントを保存する（一時ファイルに書き込んでから置き換える）
+    
+    Args:
+        output_dir (str): 出力先ディレクトリのパス
+        page_cache (dict): ページのファイル名 -> フィンガープリント
+    """
+    cache_path = os.path.join(output_dir, PAGE_CACHE_NAME)
+    dump_json(page_cache, cache_path + '.tmp')
+    os.replace(cache_path + '.tmp', cache_path)
+
+def _generate_page_worker(task):
+    """
+    ページを1件生成する（ワーカープロセス、またはページが少ない場合はメインプロセスで実行）
+    
+    Args:
+        task (tuple): (ページの種類（daily / monthly / yearly）, ページ生成関数の引数のタプル, 圧縮済みページも作成するかどうか)
         
-        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/js/bootstrap.bundle.min.js"></script>
-        <script src="js/custom.js"></script>
-    </body>
-    </html>
+    Returns:
+        tuple: (生成されたファイルのパス, ファイルのサイズ（バイト）)
     """
+    kind, args, gzip_pages = task
+    file_path, size = _PAGE_GENERATORS[kind](*args)
+    update_gzip_copy(file_path, gzip_pages)
+    return file_path, size
+
+def update_gzip_copy(file_path, gzip_pages):
+    """
+    生成したページのgzip圧縮済みのコピー（.gz）を作成、または削除する
     
-    # ファイルに保存
-    file_path = os.path.join(output_dir, f"{year}-{month}.html")
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+    Webサーバー（nginxのgzip_staticなど）は.gzがあればそちらを配信するため、
+    圧縮しない場合は古い内容のコピーが残らないように削除する
+    
+    Args:
+        file_path (str): 生成したページのパス
+        gzip_pages (bool): 圧縮済みのコピーを作成するかどうか
+    """
+    gz_path = file_path + '.gz'
+    if not gzip_pages:
+        try:
+            os.remove(gz_path)
+        except FileNotFoundError:
+            pass
+        return
     
-    return file_path
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    with open(gz_path, 'wb') as f:
+        f.write(gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0))
 
-def generate_yearly_index(year, date_logs, output_dir):
+def generate_monthly_index(year, month, date_groups, output_dir, updated_at):
     """
-    年別インデックスページを生成する
+    月別インデックスページを生成する
     
     Args:
         year (str): 年（YYYY）
-        date_logs (dict): 日付ごとのログデータ
+        month (str): 月（MM）
+        date_groups (dict): group_datesでまとめた年・年月ごとの情報
         output_dir (str): 出力先ディレクトリのパス
+        updated_at (str): ページに表示する最終更新日時
         
     Returns:
-        str: 生成されたファイルのパス
-    """
-    # 年内の月を抽出
-    months = sorted(set([d.split('-')[1] for d in date_logs.keys() if d.startswith(f"{year}-")]), reverse=True)
-    
-    # 月別リンクリスト
-    month_links = []
-    for month in months:
-        # 月内の論文数をカウント
-        month_papers_count = sum(len(date_logs[d]) for d in date_logs.keys() if d.startswith(f"{year}-{month}"))
-        month_links.append(f'<li><a href="{year}-{month}.html">{year}年{month}月</a> ({month_papers_count}件)</li>')
-    
-    # ナビゲーションリンクを作成
-    nav_html = f"""
-    <nav aria-label="breadcrumb">
-      <ol class="breadcrumb">
-        <li class="breadcrumb-item"><a href="index.html">ホーム</a></li>
-        <li class="breadcrumb-item active" aria-current="page">{year}年</li>
-      </ol>
-    </nav>
-    """
-    
-    # HTMLを生成
-    html = f"""<!DOCTYPE html>
-    <html lang="ja">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{year}年の論文要約</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/css/bootstrap.min.css" rel="stylesheet">
-        <link rel="stylesheet" href="css/custom.css">
-    </head>
-    <body>
-        <div class="container py-4">
-            <header class="pb-3 mb-4 border-bottom">
-                <div class="d-flex align-items-center text-dark text-decoration-none">
-                    <span class="fs-4">{year}年の論文要約</span>
-                    <span class="ms-auto">最終更新: {datetime.now().strftime('%Y年%m月%d日 %H:%M')}</span>
-                </div>
-            </header>
-            
-            {nav_html}
-            
-            <div class="alert alert-info">
-                <p><strong>C(・ω・ )つ みんなー！</strong> {year}年の論文要約一覧だよ！</p>
-            </div>
-            
-            <div class="row">
-                <div class="col-md-12">
-                    <div class="card">
-                        <div class="card-header">
-                            月別アーカイブ
-                        </div>
-                        <div class="card-body">
-                            <ul>
-                                {"".join(month_links)}
-                            </ul>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
+        tuple: (生成されたファイルのパス, ファイルのサイズ（バイト）)
+    """
+    # 月内の日付リンクリスト（リンク先, 表示名, 件数）
+    date_links = [
+        (f"{date}.html", f"{date[:4]}年{date[5:7]}月{date[8:10]}日", date_groups['date_counts'][date])
+        for date in date_groups['dates'].get((year, month), [])
+    ]
+    
+    # HTMLを生成（ページ全体を1つの文字列にせず、断片ごとにファイルへ書き込む）
+    html = _render_stream(
+        'archive.html',
+        title=f"{year}年{month}月の論文要約",
+        updated_at=updated_at,
+        breadcrumbs=[("index.html", "ホーム"), (f"{year}.html", f"{year}年")],
+        current_crumb=f"{year}年{month}月",
+        archive_label="日別アーカイブ",
+        links=date_links
+    )
+    
+    # ファイルに保存
+    file_path = os.path.join(output_dir, f"{year}-{month}.html")
+    size = write_page(file_path, html)
+    
+    return file_path, size
+
+def generate_yearly_index(year, date_groups, output_dir, updated_at):
+    """
+    年別インデックスページを生成する
+    
+    Args:
+        year (str): 年（YYYY）
+        date_groups (dict): group_datesでまとめた年・年月ごとの情報
+        output_dir (str): 出力先ディレクトリのパス
+        updated_at (str): ページに表示する最終更新日時
         
-        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/js/bootstrap.bundle.min.js"></script>
-        <script src="js/custom.js"></script>
-    </body>
-    </html>
+    Returns:
+        tuple: (生成されたファイルのパス, ファイルのサイズ（バイト）)
     """
+    # 月別リンクリスト（リンク先, 表示名, 件数）
+    month_links = [
+        (f"{year}-{month}.html", f"{year}年{month}月", date_groups['month_counts'][(year, month)])
+        for month in date_groups['months'].get(year, [])
+    ]
+    
+    # HTMLを生成（ページ全体を1つの文字列にせず、断片ごとにファイルへ書き込む）
+    html = _render_stream(
+        'archive.html',
+        title=f"{year}年の論文要約",
+        updated_at=updated_at,
+        breadcrumbs=[("index.html", "ホーム")],
+        current_crumb=f"{year}年",
+        archive_label="月別アーカイブ",
+        links=month_links
+    )
     
     # ファイルに保存
     file_path = os.path.join(output_dir, f"{year}.html")
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+    size = write_page(file_path, html)
     
-    return file_path
+    return file_path, size
 
-def generate_main_index(date_logs, output_dir):
+# ページの種類 -> ページ生成関数（全ページ生成時にワーカープロセスで呼び出す）
+_PAGE_GENERATORS = {
+    'daily': generate_daily_page,
+    'monthly': generate_monthly_index,
+    'yearly': generate_yearly_index,
+}
+
+def generate_main_index(date_logs, date_groups, output_dir, updated_at):
     """
     メインインデックスページを生成する
     
     Args:
         date_logs (dict): 日付ごとのログデータ
+        date_groups (dict): group_datesでまとめた年・年月ごとの情報
         output_dir (str): 出力先ディレクトリのパス
+        updated_at (str): ページに表示する最終更新日時
         
     Returns:
-        str: 生成されたファイルのパス
+        tuple: (生成されたファイルのパス, ファイルのサイズ（バイト）)
     """
     # 最新の日付を取得
-    latest_dates = sorted(date_logs.keys(), reverse=True)[:5]  # 最新5日分
+    latest_dates = heapq.nlargest(5, date_logs)  # 最新5日分
     
     # 年のリストを作成
-    years = sorted(set([d.split('-')[0] for d in date_logs.keys()]), reverse=True)
+    years = date_groups['years']
     
     # 最新の論文を取得
     latest_papers = []
     for date in latest_dates:
         latest_papers.extend(date_logs[date])
     
-    # 最新10件に制限
-    latest_papers = sorted(latest_papers, key=lambda x: x.get('timestamp', ''), reverse=True)[:10]
+    # 最新10件に制限（process_log_dataはタイムスタンプのあるログのみ論文情報にする）
+    latest_papers = heapq.nlargest(10, latest_papers, key=lambda x: x['timestamp'])
     
-    # アーカイブリンクを作成
-    archive_html = '<div class="card mt-4"><div class="card-header">アーカイブ</div><div class="card-body">'
+    # アーカイブ（年, 件数, 月別の(月, 件数)のリスト）を作成
+    archive = []
     
     # 年別リンク
     for year in years:
-        # 年内の論文数をカウント
-        year_papers_count = sum(len(date_logs[d]) for d in date_logs.keys() if d.startswith(f"{year}-"))
-        archive_html += f'<h5><a href="{year}.html">{year}年</a> ({year_papers_count}件)</h5>'
-        
         # 月別リンク（最新の年のみ表示）
+        month_counts = []
         if year == years[0]:
-            archive_html += '<ul>'
-            months = sorted(set([d.split('-')[1] for d in date_logs.keys() if d.startswith(f"{year}-")]), reverse=True)
-            for month in months:
-                # 月内の論文数をカウント
-                month_papers_count = sum(len(date_logs[d]) for d in date_logs.keys() if d.startswith(f"{year}-{month}"))
-                archive_html += f'<li><a href="{year}-{month}.html">{year}年{month}月</a> ({month_papers_count}件)</li>'
-            archive_html += '</ul>'
-    
-    archive_html += '</div></div>'
+            month_counts = [(month, date_groups['month_counts'][(year, month)]) for month in date_groups['months'][year]]
+        
+        archive.append((year, date_groups['year_counts'][year], month_counts))
     
-    # HTMLを生成
-    html = generate_html_template("arXiv論文要約", latest_papers, "", archive_html)
+    # HTMLを生成（ページ全体を1つの文字列にせず、断片ごとにファイルへ書き込む）
+    html = stream_html_template("arXiv論文要約", latest_papers, updated_at, archive=archive)
     
     # ファイルに保存
     file_path = os.path.join(output_dir, "index.html")
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+    size = write_page(file_path, html)
     
-    return file_path
+    return file_path, size
 
-def generate_html_template(title, papers, navigation="", archive=""):
+def _render_stream(template_name, **context):
     """
-    基本的なHTMLテンプレートを生成する
+    テンプレートを断片ごとに描画するストリームを返す
     
     Args:
-        title (str): ページタイトル
-        papers (list): 論文データのリスト
-        navigation (str): ナビゲーションHTML
-        archive (str): アーカイブHTML
+        template_name (str): テンプレート名
+        **context: テンプレートに渡す値
         
     Returns:
-        str: 生成されたHTML
+        jinja2.environment.TemplateStream: HTMLの断片を順に返すストリーム
     """
-    html = f"""<!DOCTYPE html>
-    <html lang="ja">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{title}</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/css/bootstrap.min.css" rel="stylesheet">
-        <link rel="stylesheet" href="css/custom.css">
-    </head>
-    <body>
-        <!-- コピー成功モーダル -->
-        <div class="modal fade" id="copyModal" tabindex="-1" aria-labelledby="copyModalLabel" aria-hidden="true">
-            <div class="modal-dialog modal-sm modal-dialog-centered">
-                <div class="modal-content">
-                    <div class="modal-body text-center py-4">
-                        <h5 class="mb-0">コピーしました</h5>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="container py-4">
-            <header class="pb-3 mb-4 border-bottom">
-                <div class="d-flex align-items-center text-dark text-decoration-none">
-                    <span class="fs-4">{title}</span>
-                    <span class="ms-auto">最終更新: {datetime.now().strftime('%Y年%m月%d日 %H:%M')}</span>
-                </div>
-            </header>
-            
-            {navigation}
-            
-            <div class="alert alert-info">
-                <p><strong>C(・ω・ )つ みんなー！</strong> 最新の論文要約をお届けします！</p>
-            </div>
-            
-            <div class="row">
-                {generate_paper_cards(papers)}
-            </div>
-            
-            {archive}
-        </div>
-        
-        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/js/bootstrap.bundle.min.js"></script>
-        <script src="js/custom.js"></script>
-    </body>
-    </html>
+    stream = _ENV.get_template(template_name).stream(**context)
+    stream.enable_buffering()
+    return stream
+
+def stream_html_template(title, papers, updated_at, breadcrumbs=None, current_crumb=None, archive=None):
     """
+    論文カードを並べたページのHTMLを断片ごとに生成する
     
-    return html
+    Args:
+        title (str): ページタイトル
+        papers (list): 論文データのリスト
+        updated_at (str): ページに表示する最終更新日時
+        breadcrumbs (list): パンくずリストの(リンク先, 表示名)のリスト
+        current_crumb (str): パンくずリストの現在のページの表示名（Noneの場合はパンくずリストを表示しない）
+        archive (list): アーカイブの(年, 件数, 月別の(月, 件数)のリスト)のリスト
+        
+    Returns:
+        jinja2.environment.TemplateStream: HTMLの断片を順に返すストリーム
+    """
+    return _render_stream(
+        'papers.html',
+        title=title,
+        updated_at=updated_at,
+        breadcrumbs=breadcrumbs or [],
+        current_crumb=current_crumb,
+        papers=papers,
+        archive=archive
+    )
 
-def generate_paper_cards(papers):
+def generate_html_template(title, papers, updated_at, breadcrumbs=None, current_crumb=None, archive=None):
     """
-    論文カードのHTMLを生成する
+    論文カードを並べたページのHTMLを生成する
     
     Args:
+        title (str): ページタイトル
         papers (list): 論文データのリスト
+        updated_at (str): ページに表示する最終更新日時
+        breadcrumbs (list): パンくずリストの(リンク先, 表示名)のリスト
+        current_crumb (str): パンくずリストの現在のページの表示名（Noneの場合はパンくずリストを表示しない）
+        archive (list): アーカイブの(年, 件数, 月別の(月, 件数)のリスト)のリスト
         
     Returns:
         str: 生成されたHTML
     """
-    cards_html = ""
-    
-    for paper in papers:
-        # arXivリンク
-        arxiv_url = ""
-        arxiv_link_small = ""
-        arxiv_link_button = ""
-        
-        # arXiv IDがある場合のみURLを表示
-        if paper.get('arxiv_id'):
-            arxiv_url = f"https://arxiv.org/abs/{paper['arxiv_id']}"
-            arxiv_link_small = f'<div class="arxiv-link"><a href="javascript:void(0);" class="copy-url" data-url="{arxiv_url}">{arxiv_url}</a></div>'
-            arxiv_link_button = f'<a href="{arxiv_url}" class="btn btn-sm btn-outline-primary">arXiv</a>'
-        
-        # Twitterリンク
-        twitter_link = ""
-        if paper.get('tweet_id'):
-            twitter_link = f'<a href="https://twitter.com/user/status/{paper["tweet_id"]}" target="_blank" class="btn btn-sm btn-outline-info ms-2">Twitter</a>'
-        
-        # 要約文
-        summary = paper.get('summary', '要約情報がありません。')
-        
-        cards_html += f"""
-        <div class="col-md-6 mb-4">
-            <div class="card paper-card h-100">
-                <div class="card-body">
-                    <h5 class="paper-title">{paper['title']}</h5>
-                    <!-- {arxiv_link_small} -->
-                    <h6 class="card-subtitle mb-2 text-muted">{paper.get('formatted_date', '')}</h6>
-                    <div class="card-text mt-3">
-                        <p class="summary-text">{arxiv_url} C(・ω・ )つ みんなー！{summary}</p>
-                    </div>
-                </div>
-                <div class="card-footer bg-transparent">
-                    {arxiv_link_button}
-                    {twitter_link}
-                </div>
-            </div>
-        </div>
-        """
-    
-    return cards_html
+    return "".join(stream_html_template(title, papers, updated_at, breadcrumbs, current_crumb, archive))
 
-def generate_webpage(log_dir, output_dir, current_only=False, current_date=None, verbose=False):
+def generate_webpage(log_dir, output_dir, current_only=False, current_date=None, verbose=False, force=False, gzip_pages=False):
     """
     Twitter投稿ログからWebページを生成する
     
@@ -519,6 +889,8 @@ def generate_webpage(log_dir, output_dir, current_only=False, current_date=None,
         output_dir (str): 出力先ディレクトリのパス
         current_only (bool): 現在の日付のページのみを生成するかどうか
         current_date (str): 現在の日付（YYYY-MM-DD形式）
+        force (bool): 全ページ生成時に、生成元に変更のないページも生成し直すかどうか
+        gzip_pages (bool): 各ページのgzip圧縮済みのコピー（.gz）も作成するかどうか
     
     Returns:
         bool: 生成が成功したかどうか
@@ -534,274 +906,163 @@ def generate_webpage(log_dir, output_dir, current_only=False, current_date=None,
         os.makedirs(js_dir, exist_ok=True)
         
         # ログファイルを取得
-        log_files = glob.glob(os.path.join(log_dir, "*_twitter_log.json"))
+        log_files = list_log_files(log_dir)
         if verbose:
-            logging.debug(f"{len(log_files)}件のログファイルを検出しました")
+            logging.debug("%s件のログファイルを検出しました", len(log_files))
         
         if not log_files:
             logging.warning("ログファイルが見つかりません。")
             return False
         
-        # 日付ごとにログを分類
-        date_logs = classify_logs_by_date(log_files)
+        # 日付ごとにログを分類（ログファイルのパスと最終更新時刻も日付ごとに記録）
+        # インデックスを開けない場合は全てのログファイルを解析する
+        date_sources = {}
+        try:
+            log_index = open_log_index(os.path.join(log_dir, LOG_INDEX_NAME))
+        except sqlite3.Error as e:
+            logging.warning("ログのインデックスを開けません。全てのログファイルを解析します: %s", e)
+            log_index = None
+        try:
+            date_logs = classify_logs_by_date(log_files, date_sources, log_index)
+        finally:
+            if log_index is not None:
+                log_index.close()
         
         if not date_logs:
             logging.warning("処理可能なログデータが見つかりません。")
             return False
         
+        # 全ページ共通の最終更新日時（ページごとに取得しない）
+        updated_at = datetime.now().strftime('%Y年%m月%d日 %H:%M')
+        
         # 現在の日付の情報を取得
         if current_only and current_date:
-            current_year, current_month, current_day = current_date.split('-')
+            current_year, current_month = current_date[:4], current_date[5:7]
+        
+        # 年・年月ごとにまとめる
+        date_groups = group_dates(date_logs)
         
-        # 日付ごとのページを生成
         if current_only:
             # 現在の日付のページのみを生成
             if current_date in date_logs:
                 if verbose:
-                    logging.debug(f"現在の日付 {current_date} のページを生成します（{len(date_logs[current_date])}件の論文）")
+                    logging.debug("現在の日付 %s のページを生成します（%s件の論文）", current_date, len(date_logs[current_date]))
                 
                 start_time = time.time()
-                file_path = generate_daily_page(current_date, date_logs[current_date], output_dir)
+                file_path, size = generate_daily_page(current_date, date_logs[current_date], output_dir, updated_at)
+                update_gzip_copy(file_path, gzip_pages)
                 end_time = time.time()
                 
-                logging.info(f"日付別ページを生成しました: {current_date}.html（所要時間: {end_time - start_time:.2f}秒）")
+                logging.info("日付別ページを生成しました: %s.html（所要時間: %.2f秒）", current_date, end_time - start_time)
                 if verbose:
-                    logging.debug(f"生成されたファイル: {file_path}（サイズ: {os.path.getsize(file_path)}バイト）")
+                    logging.debug("生成されたファイル: %s（サイズ: %sバイト）", file_path, size)
             else:
-                logging.warning(f"現在の日付 ({current_date}) のログデータが見つかりません。")
-        else:
-            # 全ての日付のページを生成
-            for date, papers in date_logs.items():
-                generate_daily_page(date, papers, output_dir)
-                logging.info(f"日付別ページを生成しました: {date}.html")
-        
-        # 年月のリストを作成
-        years = set()
-        year_months = defaultdict(set)
-        
-        for date in date_logs.keys():
-            year, month, _ = date.split('-')
-            years.add(year)
-            year_months[year].add(month)
-        
-        # 月別インデックスを生成
-        if current_only:
+                logging.warning("現在の日付 (%s) のログデータが見つかりません。", current_date)
+            
             # 現在の月のインデックスのみを生成
-            if current_year in year_months and current_month in year_months[current_year]:
+            if (current_year, current_month) in date_groups['dates']:
                 if verbose:
-                    logging.debug(f"現在の月 {current_year}-{current_month} のインデックスを生成します")
+                    logging.debug("現在の月 %s-%s のインデックスを生成します", current_year, current_month)
                 
                 start_time = time.time()
-                file_path = generate_monthly_index(current_year, current_month, date_logs, output_dir)
+                file_path, size = generate_monthly_index(current_year, current_month, date_groups, output_dir, updated_at)
+                update_gzip_copy(file_path, gzip_pages)
                 end_time = time.time()
                 
-                logging.info(f"月別インデックスを生成しました: {current_year}-{current_month}.html（所要時間: {end_time - start_time:.2f}秒）")
+                logging.info("月別インデックスを生成しました: %s-%s.html（所要時間: %.2f秒）", current_year, current_month, end_time - start_time)
                 if verbose:
-                    logging.debug(f"生成されたファイル: {file_path}（サイズ: {os.path.getsize(file_path)}バイト）")
+                    logging.debug("生成されたファイル: %s（サイズ: %sバイト）", file_path, size)
             else:
-                logging.warning(f"現在の月 ({current_year}-{current_month}) のログデータが見つかりません。")
-        else:
-            # 全ての月のインデックスを生成
-            for year in years:
-                for month in year_months[year]:
-                    generate_monthly_index(year, month, date_logs, output_dir)
-                    logging.info(f"月別インデックスを生成しました: {year}-{month}.html")
-        
-        # 年別インデックスを生成
-        if current_only:
+                logging.warning("現在の月 (%s-%s) のログデータが見つかりません。", current_year, current_month)
+            
             # 現在の年のインデックスのみを生成
-            if current_year in years:
+            if current_year in date_groups['year_counts']:
                 if verbose:
-                    logging.debug(f"現在の年 {current_year} のインデックスを生成します")
+                    logging.debug("現在の年 %s のインデックスを生成します", current_year)
                 
                 start_time = time.time()
-                file_path = generate_yearly_index(current_year, date_logs, output_dir)
+                file_path, size = generate_yearly_index(current_year, date_groups, output_dir, updated_at)
+                update_gzip_copy(file_path, gzip_pages)
                 end_time = time.time()
                 
-                logging.info(f"年別インデックスを生成しました: {current_year}.html（所要時間: {end_time - start_time:.2f}秒）")
+                logging.info("年別インデックスを生成しました: %s.html（所要時間: %.2f秒）", current_year, end_time - start_time)
                 if verbose:
-                    logging.debug(f"生成されたファイル: {file_path}（サイズ: {os.path.getsize(file_path)}バイト）")
+                    logging.debug("生成されたファイル: %s（サイズ: %sバイト）", file_path, size)
             else:
-                logging.warning(f"現在の年 ({current_year}) のログデータが見つかりません。")
+                logging.warning("現在の年 (%s) のログデータが見つかりません。", current_year)
         else:
-            # 全ての年のインデックスを生成
-            for year in years:
-                generate_yearly_index(year, date_logs, output_dir)
-                logging.info(f"年別インデックスを生成しました: {year}.html")
+            # 全ての日付別ページ、月別・年別インデックスを生成
+            # 生成元（日付別ページはログファイル、月別・年別インデックスはリンク先ごとの論文数）のフィンガープリントが
+            # 前回と同じページは生成し直さない
+            fingerprints = {}
+            for date, sources in date_sources.items():
+                fingerprints[f"{date}.html"] = page_fingerprint(sorted(sources))
+            for (year, month), dates in date_groups['dates'].items():
+                fingerprints[f"{year}-{month}.html"] = page_fingerprint([(date, date_groups['date_counts'][date]) for date in dates])
+            for year, months in date_groups['months'].items():
+                fingerprints[f"{year}.html"] = page_fingerprint([(month, date_groups['month_counts'][(year, month)]) for month in months])
+            
+            page_cache = load_page_cache(output_dir)
+            stale = {
+                name for name, fingerprint in fingerprints.items()
+                if force or page_cache.get(name) != fingerprint or not os.path.exists(os.path.join(output_dir, name))
+                or (gzip_pages and not os.path.exists(os.path.join(output_dir, name + '.gz')))
+            }
+            daily_tasks = [
+                ('daily', (date, papers, output_dir, updated_at), gzip_pages) for date, papers in date_logs.items()
+                if f"{date}.html" in stale
+            ]
+            monthly_tasks = [
+                ('monthly', (year, month, date_groups, output_dir, updated_at), gzip_pages) for year, month in date_groups['dates']
+                if f"{year}-{month}.html" in stale
+            ]
+            yearly_tasks = [
+                ('yearly', (year, date_groups, output_dir, updated_at), gzip_pages) for year in date_groups['years']
+                if f"{year}.html" in stale
+            ]
+            tasks = daily_tasks + monthly_tasks + yearly_tasks
+            num_pages = len(date_logs) + len(date_groups['dates']) + len(date_groups['years'])
+            logging.info("日付別ページ: %s件、月別インデックス: %s件、年別インデックス: %s件を生成します（%s件は変更なし）",
+                         len(daily_tasks), len(monthly_tasks), len(yearly_tasks), num_pages - len(tasks))
+            
+            # 各ページは独立しているので、ページが多い場合はプロセスを分けて並列に生成（少ない場合はその場で生成）
+            if len(tasks) < PAGE_POOL_MIN_TASKS:
+                for file_path, _ in map(_generate_page_worker, tasks):
+                    logging.info("ページを生成しました: %s", os.path.basename(file_path))
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=PAGE_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn')
+                ) as executor:
+                    for file_path, _ in executor.map(_generate_page_worker, tasks, chunksize=len(tasks) // (4 * PAGE_WORKERS)):
+                        logging.info("ページを生成しました: %s", os.path.basename(file_path))
+            
+            # 全てのページを生成できた場合のみフィンガープリントを保存
+            if fingerprints != page_cache:
+                save_page_cache(output_dir, fingerprints)
         
         # メインインデックスを生成
         if verbose:
-            logging.debug(f"メインインデックスを生成します")
+            logging.debug("メインインデックスを生成します")
         
         start_time = time.time()
-        index_path = generate_main_index(date_logs, output_dir)
+        index_path, size = generate_main_index(date_logs, date_groups, output_dir, updated_at)
+        update_gzip_copy(index_path, gzip_pages)
         end_time = time.time()
         
-        logging.info(f"メインインデックスを生成しました: index.html（所要時間: {end_time - start_time:.2f}秒）")
+        logging.info("メインインデックスを生成しました: index.html（所要時間: %.2f秒）", end_time - start_time)
         if verbose:
-            logging.debug(f"生成されたファイル: {index_path}（サイズ: {os.path.getsize(index_path)}バイト）")
-        
-        # CSSとJSファイルをコピー
-        css_dir = os.path.join(output_dir, "css")
-        js_dir = os.path.join(output_dir, "js")
-        os.makedirs(css_dir, exist_ok=True)
-        os.makedirs(js_dir, exist_ok=True)
-        
-        # カスタムCSSを作成
-        custom_css = """
-        .paper-card {
-            margin-bottom: 20px;
-            transition: transform 0.2s;
-        }
-        .paper-card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 10px 20px rgba(0,0,0,0.1);
-        }
-        .summary-text {
-            cursor: pointer;
-        }
-        .paper-title {
-            cursor: pointer;
-        }
-        .arxiv-link {
-            font-size: 0.8rem;
-            color: #6c757d;
-            margin-top: -5px;
-            margin-bottom: 10px;
-            display: block;
-        }
-        .arxiv-link a {
-            color: #6c757d;
-            text-decoration: none;
-            cursor: pointer;
-        }
-        .arxiv-link a:hover {
-            text-decoration: underline;
-        }
-        @media (max-width: 768px) {
-            .container {
-                padding-left: 10px;
-                padding-right: 10px;
-            }
-        }
-        """
-        
-        with open(os.path.join(css_dir, "custom.css"), 'w', encoding='utf-8') as f:
-            f.write(custom_css)
-        
-        # カスタムJSを作成
-        custom_js = """
-        document.addEventListener('DOMContentLoaded', function() {
-            // クリップボードにコピーする関数
-            function copyToClipboard(text) {
-                // テキストエリアを作成
-                const textarea = document.createElement('textarea');
-                textarea.value = text;
-                
-                // スタイルを設定して画面外に配置
-                textarea.style.position = 'fixed';
-                textarea.style.opacity = 0;
-                document.body.appendChild(textarea);
-                
-                // テキストを選択してコピー
-                textarea.select();
-                let success = false;
-                
-                try {
-                    // execCommandを試す
-                    success = document.execCommand('copy');
-                } catch (err) {
-                    console.error('コピーに失敗しました:', err);
-                }
-                
-                // テキストエリアを削除
-                document.body.removeChild(textarea);
-                
-                // 新しいClipboard APIも試す（execCommandが失敗した場合）
-                if (!success && navigator.clipboard) {
-                    navigator.clipboard.writeText(text).catch(err => {
-                        console.error('Clipboard APIでのコピーに失敗しました:', err);
-                    });
-                    success = true;
-                }
-                
-                return success;
-            }
-            
-            // 成功メッセージを表示
-            function showCopySuccess(element) {
-                if (!element) return;
-                
-                element.classList.add('show');
-                setTimeout(() => {
-                    element.classList.remove('show');
-                }, 2000);
-            }
-            
-            // モーダルを表示する関数
-            function showCopyModal() {
-                const copyModal = new bootstrap.Modal(document.getElementById('copyModal'));
-                copyModal.show();
-                
-                // 2秒後に自動的に閉じる
-                setTimeout(() => {
-                    copyModal.hide();
-                }, 2000);
-            }
-            
-            // 要約文のクリップボードコピー機能
-            document.querySelectorAll('.summary-text').forEach(function(element) {
-                element.addEventListener('click', function() {
-                    const text = this.textContent;
-                    const success = copyToClipboard(text);
-                    
-                    if (success) {
-                        showCopyModal();
-                    } else {
-                        console.error('要約文のコピーに失敗しました。');
-                    }
-                });
-            });
-            
-            // タイトルのクリップボードコピー機能
-            document.querySelectorAll('.paper-title').forEach(function(element) {
-                element.addEventListener('click', function() {
-                    const text = this.textContent;
-                    const success = copyToClipboard(text);
-                    
-                    if (success) {
-                        showCopyModal();
-                    } else {
-                        console.error('タイトルのコピーに失敗しました。');
-                    }
-                });
-            });
-            
-            // URLのクリップボードコピー機能
-            document.querySelectorAll('.copy-url').forEach(function(element) {
-                element.addEventListener('click', function(e) {
-                    e.preventDefault();
-                    const url = this.getAttribute('data-url');
-                    const success = copyToClipboard(url);
-                    
-                    if (success) {
-                        showCopyModal();
-                    } else {
-                        console.error('URLのコピーに失敗しました。');
-                    }
-                });
-            });
-        });
-        """
+            logging.debug("生成されたファイル: %s（サイズ: %sバイト）", index_path, size)
         
-        with open(os.path.join(js_dir, "custom.js"), 'w', encoding='utf-8') as f:
-            f.write(custom_js)
+        # CSSとJSファイルを書き込む（内容が変わっていない場合は書き込まない）
+        write_if_changed(os.path.join(css_dir, "custom.css"), _CUSTOM_CSS)
+        write_if_changed(os.path.join(js_dir, "custom.js"), _CUSTOM_JS)
         
-        logging.info(f"Webページを生成しました: {index_path}")
+        logging.info("Webページを生成しました: %s", index_path)
         return True
     
     except Exception as e:
-        logging.error(f"Webページ生成エラー: {str(e)}")
+        logging.error("Webページ生成エラー: %s", e)
         return False
 
 def generate_html(papers):
@@ -814,7 +1075,7 @@ def generate_html(papers):
     Returns:
         str: 生成されたHTML
     """
-    html = f"""<!DOCTYPE html>
+    parts = [f"""<!DOCTYPE html>
 <html lang="ja">
 <head>
     <meta charset="UTF-8">
@@ -844,7 +1105,7 @@ def generate_html(papers):
         </header>
         
         <div class="row">
-"""
+"""]
     
     for paper in papers:
         # arXivリンク（フッターとタイトル下の両方に表示）
@@ -863,14 +1124,15 @@ def generate_html(papers):
         if paper.get('tweet_id'):
             twitter_link = f'<a href="https://twitter.com/user/status/{paper["tweet_id"]}" target="_blank" class="btn btn-sm btn-outline-info ms-2">Twitter</a>'
         
-        # 要約文
-        summary = paper.get('summary', '要約情報がありません。')
+        # タイトルと要約文（HTMLとしてエスケープする）
+        title = escape(paper['title'])
+        summary = escape(paper.get('summary', '要約情報がありません。'))
         
-        html += f"""
+        parts.append(f"""
         <div class="col-md-6 mb-4">
             <div class="card paper-card h-100">
                 <div class="card-body">
-                    <h5 class="paper-title">{paper['title']}</h5>
+                    <h5 class="paper-title">{title}</h5>
                     {arxiv_link_small}
                     <h6 class="card-subtitle mb-2 text-muted">{paper['formatted_date']}</h6>
                     <div class="card-text mt-3">
@@ -884,9 +1146,9 @@ def generate_html(papers):
                 </div>
             </div>
         </div>
-"""
+""")
     
-    html += """
+    parts.append("""
         </div>
     </div>
     
@@ -894,72 +1156,100 @@ def generate_html(papers):
     <script src="js/custom.js"></script>
 </body>
 </html>
-"""
+""")
     
-    return html
+    return "".join(parts)
 
-def main():
-    """
-    メイン関数
+# コマンドライン引数のパーサー（初回の呼び出し時に作成し、以降は使い回す）
+_PARSER = None
+
+def _get_parser():
     """
-    import argparse
+    コマンドライン引数のパーサーを取得する（run_multiple_searchesから検索セットごとに呼ばれても作り直さない）
     
-    parser = argparse.ArgumentParser(
-        description='Twitter投稿ログからWebページを生成します。'
-    )
-    parser.add_argument(
-        '--log-dir',
-        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs'),
-        help='ログディレクトリのパス（デフォルト: logs/）'
-    )
-    parser.add_argument(
-        '--output-dir',
-        default='/var/www/html/arxiv',
-        help='出力先ディレクトリのパス（デフォルト: /var/www/html/arxiv/）'
-    )
-    parser.add_argument(
-        '--current-only',
-        action='store_true',
-        help='現在の日付、月、年のページのみを生成します（デフォルト: 全ページ生成）'
-    )
-    parser.add_argument(
-        '--verbose',
-        action='store_true',
-        help='詳細な出力を表示します'
-    )
+    Returns:
+        argparse.ArgumentParser: コマンドライン引数のパーサー
+    """
+    global _PARSER
+    if _PARSER is None:
+        import argparse
+        
+        _PARSER = argparse.ArgumentParser(
+            description='Twitter投稿ログからWebページを生成します。'
+        )
+        _PARSER.add_argument(
+            '--log-dir',
+            default=os.path.join(_SCRIPT_DIR, 'logs'),
+            help='ログディレクトリのパス（デフォルト: logs/）'
+        )
+        _PARSER.add_argument(
+            '--output-dir',
+            default='/var/www/html/arxiv',
+            help='出力先ディレクトリのパス（デフォルト: /var/www/html/arxiv/）'
+        )
+        _PARSER.add_argument(
+            '--current-only',
+            action='store_true',
+            help='現在の日付、月、年のページのみを生成します（デフォルト: 全ページ生成）'
+        )
+        _PARSER.add_argument(
+            '--force',
+            action='store_true',
+            help='全ページ生成時に、変更のないページも含めて全て生成し直します'
+        )
+        _PARSER.add_argument(
+            '--gzip',
+            action='store_true',
+            help='各ページのgzip圧縮済みのコピー（.html.gz）も作成します（Webサーバーのgzip_static用）'
+        )
+        _PARSER.add_argument(
+            '--verbose',
+            action='store_true',
+            help='詳細な出力を表示します'
+        )
+    return _PARSER
+
+def main(argv=None):
+    """
+    メイン関数
     
-    args = parser.parse_args()
+    Args:
+        argv (list, optional): コマンドライン引数（省略時はsys.argvを使用）
     
-    # ロギングを設定
-    # ログレベルを設定
-    log_level = logging.DEBUG if args.verbose else logging.INFO
+    Returns:
+        bool: Webページの生成に成功したかどうか
+    """
+    args = _get_parser().parse_args(argv)
     
-    # ロギングを設定
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(levelname)s - %(message)s'
-    )
+    # ロギングを設定（run_multiple_searchesなどから呼ばれ、設定済みの場合はそのまま使う）
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=logging.DEBUG if args.verbose else logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
     
     if args.verbose:
         logging.info("詳細モードで実行します")
     
     # 現在の日付を取得
-    current_date = datetime.now().strftime('%Y-%m-%d')
-    current_year, current_month, current_day = current_date.split('-')
+    current_date = datetime.now().date().isoformat()  # YYYY-MM-DD
     
     if args.current_only:
-        logging.info(f"現在の日付 ({current_date}) のページのみを生成します")
+        logging.info("現在の日付 (%s) のページのみを生成します", current_date)
     
     # Webページを生成
-    success = generate_webpage(args.log_dir, args.output_dir, args.current_only, current_date)
+    success = generate_webpage(args.log_dir, args.output_dir, args.current_only, current_date, verbose=args.verbose, force=args.force, gzip_pages=args.gzip)
     
     if success:
+        index_path = os.path.join(args.output_dir, 'index.html')
         if args.current_only:
-            print(f"現在の日付 ({current_date}) のWebページを生成しました: {os.path.join(args.output_dir, 'index.html')}")
+            print(f"現在の日付 ({current_date}) のWebページを生成しました: {index_path}")
         else:
-            print(f"全てのWebページを生成しました: {os.path.join(args.output_dir, 'index.html')}")
+            print(f"全てのWebページを生成しました: {index_path}")
     else:
         print("Webページの生成に失敗しました。")
+    
+    return success
 
 if __name__ == "__main__":
     main()
\ No newline at end of file